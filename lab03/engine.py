@@ -0,0 +1,201 @@
+import numpy as np
+from dataclasses import dataclass
+
+from grid import TorusGrid
+
+
+# Параметры модели Boids (значения по умолчанию совпадают с boids.py)
+@dataclass
+class BoidsParams:
+    width: float = 100
+    height: float = 100
+    r_neighbor: float = 15       # радиус поиска соседей
+    max_speed: float = 1.5
+    w_cohesion: float = 0.005    # вес стремления к центру соседей
+    w_alignment: float = 0.05    # вес выравнивания скорости
+    w_separation: float = 0.15   # вес отталкивания от соседей
+    r_obstacle: float = 10       # радиус реакции на препятствие
+    w_avoid: float = 0.5         # сила отталкивания от препятствия
+    block: int = 256             # сколько агентов обрабатывается за один проход
+    torus: bool = False          # искать соседей и препятствия через границы мира
+
+
+def flock_forces(pos, spd, cand_pos, cand_spd, params):
+    """
+    Cohesion + alignment + separation для блока агентов сразу.
+    pos, spd — (b, 2) агенты блока; cand_pos, cand_spd — (c, 2) кандидаты в соседи.
+    Возвращает (b, 2) — суммарное изменение скорости.
+    """
+    # квадраты расстояний от агентов блока до всех кандидатов: (b, c)
+    dx = cand_pos[None, :, 0] - pos[:, 0, None]
+    dy = cand_pos[None, :, 1] - pos[:, 1, None]
+    d2 = dx * dx + dy * dy
+    # соседи — внутри радиуса, кроме самого себя; дальше работаем только с парами-соседями
+    ii, jj = np.nonzero((d2 < params.r_neighbor ** 2) & (d2 > 0))
+    return pair_forces(pos, spd, ii, cand_pos[jj], cand_spd[jj], dx[ii, jj], dy[ii, jj], params)
+
+
+def pair_forces(pos, spd, ii, nb_pos, nb_spd, dx, dy, params):
+    """
+    Правила Boids по списку пар (агент ii, его сосед).
+    nb_pos, nb_spd — позиция и скорость соседа, dx, dy — вектор от агента до соседа.
+    """
+    b = len(pos)
+    count = np.bincount(ii, minlength=b)
+    has = count > 0
+    k = np.maximum(count, 1)
+
+    def mean(values):
+        return np.stack([np.bincount(ii, values[:, 0], b), np.bincount(ii, values[:, 1], b)], axis=1) / k[:, None]
+
+    # 1. тянуться к центру соседей
+    cohesion = (mean(nb_pos) - pos) * params.w_cohesion
+
+    # 2. выравниваться по среднему направлению соседей
+    alignment = (mean(nb_spd) - spd) * params.w_alignment
+
+    # 3. отталкиваться от слишком близких соседей
+    w = 1 / (dx * dx + dy * dy + 1e-6)
+    separation = -np.stack([np.bincount(ii, w * dx, b), np.bincount(ii, w * dy, b)], axis=1) * params.w_separation
+
+    # если соседей нет — правила не действуют
+    return np.where(has[:, None], cohesion + alignment + separation, 0.0)
+
+
+def obstacle_grid(positions, obstacles, params):
+    """
+    Сетка препятствий с ячейкой r_obstacle.
+    На торе это сам мир. В плоском мире — тор, покрывающий агентов и препятствия
+    с запасом r_obstacle по каждой оси: через такой шов ни одна пара не ближе
+    r_obstacle, поэтому запрос находит ровно тех, кого нашёл бы полный перебор.
+    """
+    r = params.r_obstacle
+    if params.torus:
+        return TorusGrid(params.width, params.height, r).build(obstacles)
+    points = np.concatenate([positions, obstacles])
+    lo = np.minimum(points.min(axis=0), 0)
+    hi = np.maximum(points.max(axis=0), [params.width, params.height])
+    size = hi - lo + r
+    return TorusGrid(size[0], size[1], r, origin=lo).build(obstacles)
+
+
+def obstacle_forces(pos, obstacle_index, params):
+    """Избегание препятствий для блока агентов (b, 2): только препятствия из соседних ячеек сетки."""
+    ii, _, dx, dy = obstacle_index.query(pos, params.r_obstacle)
+    d = np.sqrt(dx * dx + dy * dy)
+    # d == 0 пропускаем, чтобы не делить на ноль
+    near = d > 0
+    ii, dx, dy, d = ii[near], dx[near], dy[near], d[near]
+    w = params.w_avoid / d
+    return -np.stack([np.bincount(ii, w * dx, len(pos)), np.bincount(ii, w * dy, len(pos))], axis=1)
+
+
+def limit_speed(speeds, max_speed):
+    """Ограничивает длину векторов скорости значением max_speed."""
+    mag = np.linalg.norm(speeds, axis=1)
+    over = mag > max_speed
+    speeds[over] *= (max_speed / mag[over])[:, None]
+    return speeds
+
+
+def velocities(positions, speeds, obstacles, params, idx=None, index=None):
+    """
+    Новые скорости агентов idx (по умолчанию — всех).
+    Соседи ищутся среди всех positions: агенты сортируются по x,
+    и для каждого блока сравниваются только кандидаты из полосы ±r_neighbor.
+    Препятствия ищутся через сетку obstacle_grid — O(N + K), а не O(N · K).
+    При params.torus соседи ищутся через сетку TorusGrid (index — сетка прошлого кадра).
+    """
+    n = len(positions)
+    if idx is None:
+        idx = np.arange(n)
+    idx = np.asarray(idx)
+    if params.torus:
+        return torus_velocities(positions, speeds, obstacles, params, idx, index)
+    r = params.r_neighbor
+
+    order = np.argsort(positions[:, 0], kind="stable")
+    xs = positions[order, 0]
+    # препятствия — тоже через сетку, чтобы шаг не рос как N × K
+    obstacle_index = obstacle_grid(positions, obstacles, params) if len(obstacles) else None
+
+    # агенты блока тоже обрабатываем в порядке x, чтобы полоса кандидатов была узкой
+    sort = np.argsort(positions[idx, 0], kind="stable")
+    idx = idx[sort]
+    new_speeds = speeds[idx].copy()
+
+    for start in range(0, len(idx), params.block):
+        blk = idx[start:start + params.block]
+        pos = positions[blk]
+        lo = np.searchsorted(xs, pos[0, 0] - r, side="left")
+        hi = np.searchsorted(xs, pos[-1, 0] + r, side="right")
+        cand = order[lo:hi]
+
+        delta = flock_forces(pos, speeds[blk], positions[cand], speeds[cand], params)
+        if obstacle_index is not None:
+            delta += obstacle_forces(pos, obstacle_index, params)
+        new_speeds[start:start + len(blk)] += delta
+
+    limit_speed(new_speeds, params.max_speed)
+
+    # возвращаем в исходном порядке idx
+    out = np.empty_like(new_speeds)
+    out[sort] = new_speeds
+    return out
+
+
+def torus_velocities(positions, speeds, obstacles, params, idx, index=None):
+    """
+    То же, что velocities, но мир замкнут в тор: соседи и препятствия
+    за границей учитываются по кратчайшему вектору.
+    Соседи и препятствия ищутся через TorusGrid, поэтому шаг стоит O(N + K).
+    """
+    if index is None:
+        index = TorusGrid(params.width, params.height, params.r_neighbor)
+    index.build(positions)
+    obstacle_index = obstacle_grid(positions, obstacles, params)
+
+    # обходим агентов в порядке ячеек — блоки получаются компактными
+    cells = index.cell_coords(positions[idx])
+    sort = np.lexsort((cells[1], cells[0]))
+    idx = idx[sort]
+    new_speeds = speeds[idx].copy()
+
+    for start in range(0, len(idx), params.block):
+        blk = idx[start:start + params.block]
+        pos = positions[blk]
+
+        ii, jj, dx, dy = index.query(pos, params.r_neighbor)
+        near = dx * dx + dy * dy > 0
+        ii, jj, dx, dy = ii[near], jj[near], dx[near], dy[near]
+        # позиция соседа — ближайшая его копия на торе
+        nb_pos = pos[ii] + np.stack([dx, dy], axis=1)
+        delta = pair_forces(pos, speeds[blk], ii, nb_pos, speeds[jj], dx, dy, params)
+
+        delta += obstacle_forces(pos, obstacle_index, params)
+        new_speeds[start:start + len(blk)] += delta
+
+    limit_speed(new_speeds, params.max_speed)
+
+    out = np.empty_like(new_speeds)
+    out[sort] = new_speeds
+    return out
+
+
+def step(positions, speeds, obstacles, params=None, index=None):
+    """
+    Один шаг симуляции для всех агентов сразу.
+    Все правила считаются по состоянию на начало кадра.
+    index — TorusGrid, который переиспользуется между кадрами (только при params.torus).
+    Возвращает новые (positions, speeds), входные массивы не меняются.
+    """
+    if params is None:
+        params = BoidsParams()
+    positions = np.asarray(positions, dtype=float)
+    speeds = np.asarray(speeds, dtype=float)
+    obstacles = np.asarray(obstacles, dtype=float).reshape(-1, 2)
+
+    new_speeds = velocities(positions, speeds, obstacles, params, index=index)
+    # обновляем позиции, при выходе за границы — перенос на противоположную сторону
+    new_positions = (positions + new_speeds) % [params.width, params.height]
+    return new_positions, new_speeds
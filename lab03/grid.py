@@ -0,0 +1,100 @@
+import numpy as np
+
+
+class TorusGrid:
+    """
+    Равномерная сетка (spatial hash) на торе width × height.
+    Точки раскладываются по ячейкам размера не меньше cell_size,
+    поэтому все соседи в радиусе cell_size лежат в 3×3 соседних ячейках.
+    Индекс хранится как CSR: точки отсортированы по номеру ячейки (order),
+    cell_start[c]:cell_start[c+1] — диапазон точек ячейки c.
+    origin — левый нижний угол тора (по умолчанию начало координат).
+    """
+
+    def __init__(self, width, height, cell_size, origin=(0.0, 0.0)):
+        self.width, self.height = width, height
+        self.origin = np.asarray(origin, dtype=float)
+        self.nx = max(1, int(width // cell_size))
+        self.ny = max(1, int(height // cell_size))
+        self.cell_w = width / self.nx
+        self.cell_h = height / self.ny
+        # смещения соседних ячеек; на узком торе -1 и +1 совпадают, дубли не нужны
+        ox = [-1, 0, 1] if self.nx >= 3 else list(range(self.nx))
+        oy = [-1, 0, 1] if self.ny >= 3 else list(range(self.ny))
+        self.offsets = np.array([(a, b) for a in ox for b in oy])
+        self.points = np.empty((0, 2))
+        self.order = np.empty(0, dtype=np.intp)
+        self.cell_start = np.zeros(self.nx * self.ny + 1, dtype=np.intp)
+
+    def cell_coords(self, points):
+        cx = ((points[:, 0] - self.origin[0]) // self.cell_w).astype(np.intp) % self.nx
+        cy = ((points[:, 1] - self.origin[1]) // self.cell_h).astype(np.intp) % self.ny
+        return cx, cy
+
+    def build(self, points):
+        """
+        Перестраивает индекс по новым позициям.
+        Между кадрами агенты почти не меняют ячейку, поэтому сортируем
+        в порядке прошлого кадра: устойчивая сортировка почти упорядоченного
+        массива идёт за линейное время.
+        """
+        points = np.asarray(points, dtype=float)
+        cx, cy = self.cell_coords(points)
+        cells = cx * self.ny + cy
+        if len(self.order) == len(points):
+            prev = self.order
+            order = prev[np.argsort(cells[prev], kind="stable")]
+        else:
+            order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=self.nx * self.ny)
+        self.cell_start[1:] = np.cumsum(counts)
+        self.points = points
+        self.order = order
+        return self
+
+    def query(self, centers, radius):
+        """
+        Все пары (центр, точка индекса) ближе radius с учётом переноса через границы.
+        Возвращает owner (номер центра, по возрастанию), index (номер точки)
+        и dx, dy — кратчайший вектор от центра до точки на торе.
+        """
+        if (radius > self.cell_w and self.nx > 1) or (radius > self.cell_h and self.ny > 1):
+            raise ValueError("radius больше размера ячейки сетки")
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        q, k = len(centers), len(self.offsets)
+
+        # ячейки 3×3 вокруг каждого центра: (q, k)
+        cx, cy = self.cell_coords(centers)
+        cells = ((cx[:, None] + self.offsets[:, 0]) % self.nx) * self.ny \
+            + (cy[:, None] + self.offsets[:, 1]) % self.ny
+        start = self.cell_start[cells].ravel()
+        count = self.cell_start[cells + 1].ravel() - start
+
+        # разворачиваем диапазоны ячеек в плоский список кандидатов
+        total = count.sum()
+        seg = np.repeat(np.arange(q * k), count)
+        first = np.cumsum(count) - count
+        offset = np.arange(total) - np.repeat(first, count)
+        index = self.order[np.repeat(start, count) + offset]
+        owner = seg // k
+
+        # кратчайший вектор на торе
+        dx = self.points[index, 0] - centers[owner, 0]
+        dy = self.points[index, 1] - centers[owner, 1]
+        dx -= self.width * np.round(dx / self.width)
+        dy -= self.height * np.round(dy / self.height)
+
+        keep = dx * dx + dy * dy < radius * radius
+        return owner[keep], index[keep], dx[keep], dy[keep]
+
+    def neighbors(self, radius):
+        """
+        Списки соседей всех точек индекса (без самой точки) в формате CSR:
+        соседи точки i — indices[indptr[i]:indptr[i+1]].
+        """
+        owner, index, dx, dy = self.query(self.points, radius)
+        keep = index != owner
+        owner, index = owner[keep], index[keep]
+        indptr = np.zeros(len(self.points) + 1, dtype=np.intp)
+        indptr[1:] = np.cumsum(np.bincount(owner, minlength=len(self.points)))
+        return indptr, index
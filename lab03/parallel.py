@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from engine import BoidsParams, velocities
+from grid import TorusGrid
+
+# Состояние процесса-воркера: массивы поверх общей памяти
+_worker = {}
+
+
+def _attach(names, n, k, params):
+    """Инициализатор воркера: подключается к общей памяти один раз, без копирования."""
+    _worker["shm"] = [shared_memory.SharedMemory(name=name) for name in names]
+    pos, spd, new_spd, obst = _worker["shm"]
+    _worker["positions"] = np.ndarray((n, 2), dtype=float, buffer=pos.buf)
+    _worker["speeds"] = np.ndarray((n, 2), dtype=float, buffer=spd.buf)
+    _worker["new_speeds"] = np.ndarray((n, 2), dtype=float, buffer=new_spd.buf)
+    _worker["obstacles"] = np.ndarray((k, 2), dtype=float, buffer=obst.buf)
+    _worker["params"] = params
+
+
+def _in_band(x, lo, hi, width, wrap):
+    """Маска x ∈ [lo, hi); при wrap полоса может переходить через границу мира."""
+    if not wrap:
+        return (x >= lo) & (x < hi)
+    if hi - lo >= width:
+        return np.ones(len(x), dtype=bool)
+    lo, hi = lo % width, hi % width
+    if lo < hi:
+        return (x >= lo) & (x < hi)
+    return (x >= lo) | (x < hi)
+
+
+def _tile(x0, x1):
+    """
+    Считает новые скорости агентов своей полосы [x0, x1) (последняя полоса — включая x1).
+    Соседей берёт из полосы, расширенной на r_neighbor с каждой стороны (halo),
+    и пишет результат прямо в общий массив new_speeds.
+    """
+    positions, speeds = _worker["positions"], _worker["speeds"]
+    params = _worker["params"]
+    x = positions[:, 0]
+
+    r = params.r_neighbor
+    local = np.nonzero(_in_band(x, x0 - r, x1 + r, params.width, params.torus))[0]
+    owned = _in_band(x[local], x0, x1, params.width, False)
+    if x1 >= params.width:
+        # после positions %= width бывает x == width ((-1e-17) % 100 == 100.0): это последняя полоса
+        owned |= x[local] >= params.width
+    if not owned.any():
+        return 0
+
+    local_pos, local_spd = positions[local], speeds[local]
+    index = TorusGrid(params.width, params.height, r) if params.torus else None
+    new = velocities(local_pos, local_spd, _worker["obstacles"], params,
+                     idx=np.nonzero(owned)[0], index=index)
+    _worker["new_speeds"][local[owned]] = new
+    return len(new)
+
+
+class ParallelFlock:
+    """
+    Параллельный шаг Boids: мир режется на вертикальные полосы,
+    каждая полоса считается в отдельном процессе.
+    positions/speeds лежат в общей памяти, воркеры читают их без передачи массивов.
+    Семантика шага та же, что у engine.step: все правила по состоянию начала кадра.
+    При torus суммы по соседям складываются в другом порядке (bincount по подмножеству),
+    поэтому скорости могут отличаться от engine.step на ~1e-16 и расходиться со временем.
+    """
+
+    def __init__(self, positions, speeds, obstacles, params=None, workers=None, tiles=None):
+        self.params = params if params is not None else BoidsParams()
+        n, k = len(positions), len(obstacles)
+        self.workers = workers or os.cpu_count() or 1
+        # полос больше, чем процессов, чтобы выровнять нагрузку
+        self.tiles = tiles or 2 * self.workers
+
+        self._shm = [shared_memory.SharedMemory(create=True, size=max(1, m * 2 * 8))
+                     for m in (n, n, n, k)]
+        pos, spd, new_spd, obst = self._shm
+        self.positions = np.ndarray((n, 2), dtype=float, buffer=pos.buf)
+        self.speeds = np.ndarray((n, 2), dtype=float, buffer=spd.buf)
+        self.new_speeds = np.ndarray((n, 2), dtype=float, buffer=new_spd.buf)
+        self.obstacles = np.ndarray((k, 2), dtype=float, buffer=obst.buf)
+        self.positions[:] = positions
+        self.speeds[:] = speeds
+        self.obstacles[:] = np.asarray(obstacles, dtype=float).reshape(-1, 2)
+
+        self.pool = ProcessPoolExecutor(
+            self.workers, initializer=_attach,
+            initargs=([s.name for s in self._shm], n, k, self.params))
+
+    def step(self):
+        """Один шаг для всех агентов; positions и speeds обновляются на месте."""
+        edges = np.linspace(0, self.params.width, self.tiles + 1)
+        futures = [self.pool.submit(_tile, edges[i], edges[i + 1]) for i in range(self.tiles)]
+        for fut in futures:
+            fut.result()
+        self.speeds[:] = self.new_speeds
+        self.positions += self.new_speeds
+        self.positions %= [self.params.width, self.params.height]
+        return self.positions, self.speeds
+
+    def close(self):
+        self.pool.shutdown()
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
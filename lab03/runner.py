@@ -0,0 +1,116 @@
+import argparse
+import itertools
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from engine import BoidsParams, step
+from grid import TorusGrid
+from parallel import ParallelFlock
+
+
+class Simulation:
+    """
+    Состояние стаи без глобальных переменных и без отрисовки.
+    Хранит позиции, скорости, препятствия и сетку соседей между шагами.
+    workers — считать шаг в пуле процессов (ParallelFlock) вместо одного процесса.
+    """
+
+    def __init__(self, n, params=None, n_obstacles=10, seed=None, workers=None):
+        self.params = params if params is not None else BoidsParams()
+        rng = np.random.default_rng(seed)
+        size = [self.params.width, self.params.height]
+        self.positions = rng.random((n, 2)) * size
+        self.speeds = (rng.random((n, 2)) - 0.5) * 2 * self.params.max_speed
+        self.obstacles = rng.random((n_obstacles, 2)) * size
+        self.index = TorusGrid(self.params.width, self.params.height, self.params.r_neighbor)
+        self.frame = 0
+        self.flock = None
+        if workers:
+            self.flock = ParallelFlock(self.positions, self.speeds, self.obstacles, self.params, workers)
+
+    def advance(self, k=1, sink=None):
+        """
+        Продвигает стаю на k шагов; возвращает время каждого шага в секундах.
+        sink — куда писать кадры (например, trajectory.TrajectoryWriter), в замер не входит.
+        """
+        timings = np.empty(k)
+        for i in range(k):
+            t0 = time.perf_counter()
+            if self.flock is not None:
+                self.positions, self.speeds = self.flock.step()
+            else:
+                self.positions, self.speeds = step(
+                    self.positions, self.speeds, self.obstacles, self.params, self.index)
+            timings[i] = time.perf_counter() - t0
+            self.frame += 1
+            if sink is not None:
+                sink.append(self.positions, self.speeds)
+        return timings
+
+    def close(self):
+        if self.flock is not None:
+            self.positions, self.speeds = self.positions.copy(), self.speeds.copy()
+            self.flock.close()
+            self.flock = None
+
+
+def run(n, steps, params=None, n_obstacles=10, seed=None, warmup=1, workers=None):
+    """Создаёт стаю из n агентов и прогоняет steps шагов; возвращает (simulation, timings)."""
+    sim = Simulation(n, params, n_obstacles, seed, workers)
+    try:
+        sim.advance(warmup)
+        timings = sim.advance(steps)
+    finally:
+        sim.close()
+    return sim, timings
+
+
+def benchmark(ns, radii, obstacle_counts, steps=10, params=None, density=None, seed=0, workers=None):
+    """
+    Матрица замеров по числу агентов, радиусу соседства и числу препятствий.
+    density — агентов на единицу площади: если задана, размер мира растёт с N,
+    иначе берётся из params. Возвращает список строк-словарей.
+    """
+    base = params if params is not None else BoidsParams()
+    rows = []
+    for n, r, k in itertools.product(ns, radii, obstacle_counts):
+        p = replace(base, r_neighbor=r)
+        if density is not None:
+            side = float(np.sqrt(n / density))
+            p = replace(p, width=side, height=side)
+        _, timings = run(n, steps, p, k, seed, workers=workers)
+        rows.append({
+            "n": n,
+            "r_neighbor": r,
+            "obstacles": k,
+            "world": p.width,
+            "median_ms": float(np.median(timings) * 1000),
+            "fps": float(1 / np.median(timings)),
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'N':>8} {'r':>6} {'obst':>6} {'world':>8} {'ms/шаг':>10} {'fps':>8}")
+    for row in rows:
+        print(f"{row['n']:>8} {row['r_neighbor']:>6g} {row['obstacles']:>6} "
+              f"{row['world']:>8.0f} {row['median_ms']:>10.2f} {row['fps']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры скорости шага Boids без отрисовки")
+    parser.add_argument("--n", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--r", type=float, nargs="+", default=[5, 15])
+    parser.add_argument("--obstacles", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--steps", type=int, default=10)
+    # плотность как в boids.py: 30 агентов на поле 100×100
+    parser.add_argument("--density", type=float, default=30 / (100 * 100))
+    parser.add_argument("--flat", action="store_true", help="без переноса через границы (torus=False)")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (ParallelFlock)")
+    args = parser.parse_args()
+
+    rows = benchmark(args.n, args.r, args.obstacles, args.steps,
+                     BoidsParams(torus=not args.flat), args.density, workers=args.workers)
+    print_table(rows)
@@ -0,0 +1,151 @@
+import argparse
+
+import numpy as np
+
+# Формат файла траектории:
+#   заголовок 64 байта (HEADER), затем кадры подряд:
+#   float32 [capacity, n_agents, 4] — x, y, vx, vy каждого агента
+MAGIC = b"BOIDTRJ1"
+HEADER = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("n_agents", "<u4"),
+    ("capacity", "<u8"),
+    ("frames", "<u8"),        # сколько кадров уже записано
+    ("width", "<f8"),
+    ("height", "<f8"),
+    ("reserved", "V16"),
+])
+HEADER_SIZE = HEADER.itemsize
+CHANNELS = 4
+
+
+class TrajectoryWriter:
+    """
+    Потоковая запись кадров в заранее выделенный файл через memmap.
+    В памяти процесса ничего не копится: append пишет кадр прямо в отображение файла.
+    """
+
+    def __init__(self, path, n_agents, capacity, width=0, height=0):
+        self.path = path
+        self.header = np.memmap(path, dtype=HEADER, mode="w+", shape=(1,))
+        self.header[0] = (MAGIC, 1, n_agents, capacity, 0, width, height, b"")
+        self.data = np.memmap(path, dtype=np.float32, mode="r+", offset=HEADER_SIZE,
+                              shape=(capacity, n_agents, CHANNELS))
+        self.frames = 0
+
+    def append(self, positions, speeds):
+        if self.frames >= len(self.data):
+            raise ValueError(f"файл траектории заполнен ({len(self.data)} кадров)")
+        frame = self.data[self.frames]
+        frame[:, :2] = positions
+        frame[:, 2:] = speeds
+        self.frames += 1
+        self.header["frames"] = self.frames
+
+    def flush(self):
+        self.data.flush()
+        self.header.flush()
+
+    def close(self):
+        self.flush()
+        # освобождаем отображения файла
+        self.data = self.header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Ленивое чтение траектории: срезы кадров — это memmap-представления,
+    данные подгружаются с диска только при обращении.
+    """
+
+    def __init__(self, path):
+        header = np.fromfile(path, dtype=HEADER, count=1)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"{path}: не файл траектории Boids")
+        self.n_agents = int(header["n_agents"])
+        self.capacity = int(header["capacity"])
+        self.width, self.height = float(header["width"]), float(header["height"])
+        frames = int(header["frames"])
+        self.data = np.memmap(path, dtype=np.float32, mode="r", offset=HEADER_SIZE,
+                              shape=(self.capacity, self.n_agents, CHANNELS))[:frames]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, item):
+        return self.data[item]
+
+    def positions(self, start=None, stop=None, step=None):
+        return self.data[start:stop:step, :, :2]
+
+    def speeds(self, start=None, stop=None, step=None):
+        return self.data[start:stop:step, :, 2:]
+
+    def iter_frames(self, start=0, stop=None, step=1):
+        """Кадр за кадром: (positions, speeds) как float32-представления файла."""
+        for i in range(*slice(start, stop, step).indices(len(self))):
+            frame = self.data[i]
+            yield frame[:, :2], frame[:, 2:]
+
+
+def record(path, n, frames, params=None, n_obstacles=10, seed=None):
+    """Прогоняет стаю без отрисовки и пишет каждый кадр в файл траектории."""
+    from engine import BoidsParams
+    from runner import Simulation
+
+    sim = Simulation(n, params or BoidsParams(torus=True), n_obstacles, seed)
+    with TrajectoryWriter(path, n, frames, sim.params.width, sim.params.height) as sink:
+        sim.advance(frames, sink)
+    return sim
+
+
+def replay(path, start=0, stop=None, step=1, interval=50):
+    """Анимация по записанному файлу: кадры читаются с диска по мере показа."""
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    reader = TrajectoryReader(path)
+    frames = reader.iter_frames(start, stop, step)
+    first, _ = next(frames)
+
+    fig, ax = plt.subplots()
+    scat = ax.scatter(first[:, 0], first[:, 1], c='b')
+    ax.set_xlim(0, reader.width or first[:, 0].max())
+    ax.set_ylim(0, reader.height or first[:, 1].max())
+
+    def update(frame):
+        positions, _ = frame
+        scat.set_offsets(positions)
+        return scat,
+
+    ani = FuncAnimation(fig, update, frames=frames, interval=interval, cache_frame_data=False)
+    plt.show()
+    return ani
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Запись и просмотр траекторий Boids")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("path")
+    rec.add_argument("--n", type=int, default=30)
+    rec.add_argument("--frames", type=int, default=1000)
+    rec.add_argument("--seed", type=int, default=None)
+    rep = sub.add_parser("replay")
+    rep.add_argument("path")
+    rep.add_argument("--start", type=int, default=0)
+    rep.add_argument("--stop", type=int, default=None)
+    rep.add_argument("--step", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.path, args.n, args.frames, seed=args.seed)
+    else:
+        replay(args.path, args.start, args.stop, args.step)
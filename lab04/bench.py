@@ -0,0 +1,128 @@
+import argparse
+import time
+
+import numpy as np
+
+import life
+from hashlife import HashlifeBoard
+from tiles import TileStepper
+
+
+def _loop(boards, generations):
+    from game import step as step_loop   # исходный поклеточный step()
+    out = []
+    for g in boards:
+        for _ in range(generations):
+            g = step_loop(g)
+        out.append(g)
+    return np.stack(out)
+
+
+def _roll(boards, generations):
+    for _ in range(generations):
+        boards = life.step(boards)
+    return boards
+
+
+def _packed(boards, generations):
+    return life.step_many(boards, generations, packed=True)
+
+
+def _tiles(boards, generations):
+    return np.stack([TileStepper(g, 32).run(generations) for g in boards])
+
+
+def _hashlife(boards, generations):
+    return np.stack([HashlifeBoard(g).advance(generations).grid for g in boards])
+
+
+ENGINES = {
+    "loop": _loop,          # исходный step() из game.py
+    "roll": _roll,          # life.step
+    "packed": _packed,      # life.step_packed, 64 клетки в слове
+    "tiles": _tiles,        # TileStepper, только активные плитки
+    "hashlife": _hashlife,  # HashlifeBoard (стороны — степени двойки)
+}
+
+
+def random_boards(batch, n, m=None, prob_live=0.3, seed=0):
+    """batch независимых случайных досок (batch, N, M)."""
+    rng = np.random.default_rng(seed)
+    return (rng.random((batch, n, m or n)) < prob_live).astype(np.uint8)
+
+
+def run_batch(boards, generations, engine="roll"):
+    """
+    Прогоняет пачку досок (B, N, M) на generations поколений без отрисовки.
+    Возвращает (доски, статистика), где cell_updates_per_s = B·N·M·G / время.
+    """
+    boards = np.asarray(boards, dtype=np.uint8)
+    t0 = time.perf_counter()
+    out = ENGINES[engine](boards, generations)
+    elapsed = time.perf_counter() - t0
+    cells = boards.size * generations
+    return out, {
+        "engine": engine,
+        "batch": boards.shape[0],
+        "shape": boards.shape[1:],
+        "generations": generations,
+        "seconds": elapsed,
+        "cell_updates_per_s": cells / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def _supported(engine, n):
+    if engine == "loop":
+        return n <= 64           # дальше поклеточный цикл идёт минутами
+    if engine == "hashlife":
+        # на плотных случайных досках повторов мало, и дерево на Python лишь тормозит
+        return 4 <= n <= 256 and n & (n - 1) == 0
+    return True
+
+
+def benchmark(sizes, engines, batch=1, budget=2e7, max_generations=100, seed=0, report=None):
+    """
+    Замеры всех движков на квадратных досках заданных размеров.
+    Число поколений подбирается так, чтобы на размер приходилось ~budget клеткообновлений.
+    Результат каждого движка сверяется с первым в списке.
+    report(stats) вызывается после каждого замера.
+    """
+    rows = []
+    for n in sizes:
+        boards = random_boards(batch, n, seed=seed)
+        gens = int(max(1, min(max_generations, budget // boards.size)))
+        reference = None
+        for engine in engines:
+            if not _supported(engine, n):
+                continue
+            out, stats = run_batch(boards, gens, engine)
+            if reference is None:
+                reference = out
+            stats["matches"] = bool(np.array_equal(out, reference))
+            rows.append(stats)
+            if report is not None:
+                report(stats)
+    return rows
+
+
+def print_header():
+    print(f"{'размер':>11} {'B':>3} {'движок':>9} {'G':>5} {'сек':>9} {'клеток/с':>12} {'сверка':>7}")
+
+
+def print_row(r):
+    size = "×".join(map(str, r["shape"]))
+    print(f"{size:>11} {r['batch']:>3} {r['engine']:>9} {r['generations']:>5} "
+          f"{r['seconds']:>9.3f} {r['cell_updates_per_s']:>12.3g} {'да' if r['matches'] else 'НЕТ':>7}",
+          flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры движков «Игры Жизнь» без отрисовки")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 64, 256, 1024, 4096, 8192])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=2e7, help="клеткообновлений на размер")
+    args = parser.parse_args()
+
+    print_header()
+    benchmark(args.sizes, args.engines, args.batch, args.budget, report=print_row)
@@ -0,0 +1,105 @@
+import numpy as np
+
+import life
+
+
+class CycleDetector:
+    """
+    Поиск устойчивого состояния и циклов по истории хешей поколений.
+    Хеш Зобриста: XOR случайных 64-битных ключей живых клеток. Между поколениями
+    он пересчитывается только по изменившимся клеткам.
+    Совпадение хеша проверяется честным прогоном period шагов, поэтому коллизии
+    не дают ложных срабатываний.
+    """
+
+    def __init__(self, shape, step=life.step, seed=0):
+        rng = np.random.default_rng(seed)
+        self.keys = rng.integers(0, 1 << 64, size=shape, dtype=np.uint64)
+        self.step = step
+        self.reset(np.zeros(shape, dtype=np.uint8))
+
+    def _hash(self, mask):
+        return int(np.bitwise_xor.reduce(self.keys[mask])) if mask.any() else 0
+
+    def reset(self, grid, generation=0):
+        """Начать историю заново (например, после ручного изменения доски)."""
+        self.prev = np.array(grid) != 0
+        self.hash = self._hash(self.prev)
+        self.generation = generation
+        self.history = {self.hash: generation}
+        self.period = None       # период найденного цикла (1 — неподвижная фигура)
+        self.start = None        # поколение, с которого начался цикл
+
+    @property
+    def stable(self):
+        return self.period is not None
+
+    def update(self, grid):
+        """
+        Учесть следующее поколение. Возвращает период, если доска
+        вошла в цикл, иначе None.
+        """
+        cur = np.asarray(grid) != 0
+        self.hash ^= self._hash(cur != self.prev)
+        self.prev = cur
+        self.generation += 1
+        if self.period is not None:
+            return self.period
+
+        seen = self.history.get(self.hash)
+        if seen is not None and self._verify(grid, self.generation - seen):
+            self.period = self.generation - seen
+            self.start = seen
+        else:
+            self.history[self.hash] = self.generation
+        return self.period
+
+    def _verify(self, grid, period):
+        g = np.asarray(grid)
+        for _ in range(period):
+            g = self.step(g)
+        return np.array_equal(g != 0, self.prev)
+
+    def fast_forward(self, grid, generation):
+        """
+        Доска в поколении generation без прогона всех промежуточных шагов:
+        после входа в цикл нужно не больше period - 1 шагов.
+        """
+        if self.period is None:
+            raise ValueError("цикл ещё не найден")
+        g = np.asarray(grid)
+        for _ in range((generation - self.generation) % self.period):
+            g = self.step(g)
+        return g
+
+
+def run_until_stable(grid, max_generations, step=life.step):
+    """
+    Прогоняет доску, пока она не станет неподвижной или периодической.
+    Возвращает (доска, детектор): detector.generation — на каком поколении
+    остановились, detector.period и detector.start — найденный цикл (или None).
+    """
+    detector = CycleDetector(np.shape(grid), step)
+    detector.reset(grid)
+    for _ in range(max_generations):
+        grid = step(grid)
+        if detector.update(grid) is not None:
+            break
+    return grid, detector
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    for shape in [(30, 30), (64, 64)]:
+        g = rng.choice([0, 1], size=shape, p=[0.7, 0.3])
+        final, det = run_until_stable(g, 5000)
+        if det.period is None:
+            print(f"{shape}: за {det.generation} поколений цикл не найден")
+            continue
+        print(f"{shape}: поколение {det.generation}, период {det.period}, цикл с поколения {det.start}")
+        # проверка перемотки против прямого прогона
+        target = det.generation + 1001
+        ref = final
+        for _ in range(1001):
+            ref = life.step(ref)
+        assert np.array_equal(det.fast_forward(final, target), ref)
@@ -3,6 +3,9 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from matplotlib.widgets import Button
 
+import life
+from cycles import CycleDetector
+
 
 N, M = 30, 30
 prob_live = 0.3          # вероятность того, что клетка изначально живая
@@ -11,10 +14,18 @@ prob_live = 0.3          # вероятность того, что клетка
 # создаём случайную сетку клеток: 1 = живая, 0 = мёртвая
 grid = np.random.choice([0, 1], size=(N, M), p=[1 - prob_live, prob_live])
 
+# следим, не зациклилась ли доска; кадры найденного цикла показываем без пересчёта
+detector = CycleDetector(grid.shape)
+detector.reset(grid)
+cycle = None
+
 # Функция подсчёта соседей 
 def count_neighbors(g, x, y):
-    # возвращает количество живых соседей клетки (x, y)
-    return np.sum(g[(x-1):(x+2) % N, (y-1):(y+2) % M]) - g[x, y]
+    # возвращает количество живых соседей клетки (x, y), границы соединены
+    n, m = g.shape
+    rows = np.arange(x - 1, x + 2) % n
+    cols = np.arange(y - 1, y + 2) % m
+    return np.sum(g[np.ix_(rows, cols)]) - g[x, y]
 
 # Функция одного шага игры
 def step(grid):
@@ -23,7 +34,9 @@ def step(grid):
     - Живые клетки с <2 или >3 соседями умирают
     - Живые с 2-3 соседями продолжают жить
     - Мёртвые клетки с ровно 3 соседями оживают
+    Поклеточная эталонная версия; в анимации используется life.step.
     """
+    N, M = grid.shape
     new_grid = np.zeros_like(grid)  # создаём новую сетку
     for i in range(N):
         for j in range(M):
@@ -48,34 +61,58 @@ def add_blinker(event=None):
     Добавляет осциллирующий паттерн Blinker в случайное место сетки.
     Blinker — 3 живые клетки в ряд (горизонтально).
     """
+    global cycle
     blinker = np.array([[1, 1, 1]])
     r = np.random.randint(0, N - 1)   # случайная строка
     c = np.random.randint(0, M - 3)   # случайный столбец
     grid[r:r+1, c:c+3] = blinker     # вставляем паттерн
     print(f"Blinker добавлен в ({r}, {c})")
-
-# Настройка визуализации
-fig, ax = plt.subplots()
-plt.subplots_adjust(bottom=0.2)  # оставляем место для кнопки
-# создаём изображение сетки
-img = ax.imshow(grid, cmap='gray', interpolation='nearest')
-ax.set_title("Conway's Game of Life")
-
-# Кнопка для добавления Blinker
-ax_button = plt.axes([0.4, 0.05, 0.2, 0.075])  # положение кнопки
-btn = Button(ax_button, "Добавить Blinker")
-btn.on_clicked(add_blinker)
+    # доска изменилась — прежняя история поколений больше не верна
+    detector.reset(grid)
+    cycle = None
 
 # Обновление анимации
 def update(frame):
     """
     Обновляет сетку для следующего кадра анимации
     """
-    global grid
-    grid[:] = step(grid)     # вычисляем следующее поколение
+    global grid, cycle
+    if cycle is not None:
+        # доска в цикле: берём готовый кадр вместо вычисления
+        grid[:] = cycle[(frame - cycle_frame) % len(cycle)]
+        img.set_data(grid)
+        return img,
+    grid[:] = life.step(grid)     # вычисляем следующее поколение сразу для всей сетки
     img.set_data(grid)       # обновляем изображение
+    if detector.update(grid) is not None:
+        start_cycle(frame)
     return img,
 
-# Запуск анимации 
-ani = FuncAnimation(fig, update, interval=500, blit=True)
-plt.show()
+def start_cycle(frame):
+    """Запоминает кадры найденного цикла, дальше анимация только их повторяет"""
+    global cycle, cycle_frame
+    p = detector.period
+    print(f"Кадр {frame + 1}: " +
+          ("доска неподвижна" if p == 1 else f"цикл с периодом {p}"))
+    frames, g = [], grid.copy()
+    for _ in range(p):
+        g = life.step(g)
+        frames.append(g)
+    cycle, cycle_frame = frames, frame + 1
+
+if __name__ == "__main__":
+    # Настройка визуализации
+    fig, ax = plt.subplots()
+    plt.subplots_adjust(bottom=0.2)  # оставляем место для кнопки
+    # создаём изображение сетки
+    img = ax.imshow(grid, cmap='gray', interpolation='nearest')
+    ax.set_title("Conway's Game of Life")
+
+    # Кнопка для добавления Blinker
+    ax_button = plt.axes([0.4, 0.05, 0.2, 0.075])  # положение кнопки
+    btn = Button(ax_button, "Добавить Blinker")
+    btn.on_clicked(add_blinker)
+
+    # Запуск анимации 
+    ani = FuncAnimation(fig, update, interval=500, blit=True)
+    plt.show()
@@ -0,0 +1,337 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+# Hashlife: вселенная хранится квадродеревом с каноническими (общими) узлами,
+# а будущее каждого узла запоминается. Повторяющиеся участки считаются один раз,
+# поэтому можно прыгать сразу на 2^k поколений.
+
+
+class Node:
+    """
+    Узел уровня k — квадрат 2^k × 2^k из четырёх узлов уровня k-1.
+    Узлы канонические: одинаковое содержимое — один и тот же объект,
+    поэтому сравнение и хеширование идут по идентичности.
+    """
+    __slots__ = ("nw", "ne", "sw", "se", "level", "pop", "code", "__weakref__")
+
+    def __init__(self, nw, ne, sw, se, level, pop, code=None):
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level
+        self.pop = pop            # число живых клеток
+        self.code = code          # битовый код клеток для уровней 0..2 (бит 4*строка+столбец)
+
+
+# Листья — отдельные клетки
+OFF = Node(None, None, None, None, 0, 0, 0)
+ON = Node(None, None, None, None, 0, 1, 1)
+
+
+def _base_table():
+    """
+    Следующее поколение центра 2×2 для всех 65536 квадратов 4×4.
+    Возвращает коды результата в раскладке уровня 1 (биты 0, 1, 4, 5).
+    """
+    codes = np.arange(1 << 16)
+    cells = ((codes[:, None] >> np.arange(16)) & 1).reshape(-1, 4, 4)
+    out = np.zeros(1 << 16, dtype=np.int64)
+    for r in (1, 2):
+        for c in (1, 2):
+            n = cells[:, r - 1:r + 2, c - 1:c + 2].sum(axis=(1, 2)) - cells[:, r, c]
+            alive = (n == 3) | ((cells[:, r, c] == 1) & (n == 2))
+            out |= alive.astype(np.int64) << (4 * (r - 1) + (c - 1))
+    return out
+
+
+class Hashlife:
+    """
+    Хранилище канонических узлов и кеш результатов.
+    Таблица узлов слабая: узел живёт, пока на него ссылаются корень или кеш.
+    Кеш результатов ограничен cache_size записями и вытесняет давно не использованные (LRU).
+    """
+
+    def __init__(self, cache_size=1 << 20):
+        self.cache_size = cache_size
+        self._nodes = weakref.WeakValueDictionary()
+        self._results = OrderedDict()
+        self._empty = [OFF]
+        self.hits = self.misses = 0
+        self._level1 = [self._make_level1(code) for code in range(64)]
+        self._base = [self._level1[c] for c in _base_table().tolist()]
+
+    def _make_level1(self, code):
+        leaf = [OFF, ON]
+        return self.join(leaf[code & 1], leaf[code >> 1 & 1],
+                         leaf[code >> 4 & 1], leaf[code >> 5 & 1])
+
+    def join(self, nw, ne, sw, se):
+        """Канонический узел из четырёх четвертей."""
+        key = (id(nw), id(ne), id(sw), id(se))
+        node = self._nodes.get(key)
+        if node is None:
+            level = nw.level + 1
+            code = None
+            if level == 1:
+                code = nw.code | ne.code << 1 | sw.code << 4 | se.code << 5
+            elif level == 2:
+                code = nw.code | ne.code << 2 | sw.code << 8 | se.code << 10
+            node = Node(nw, ne, sw, se, level, nw.pop + ne.pop + sw.pop + se.pop, code)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def centre(self, m):
+        """Узел уровня k+1, в центре которого лежит m, вокруг — пустота."""
+        e = self.empty(m.level - 1)
+        return self.join(self.join(e, e, e, m.nw), self.join(e, e, m.ne, e),
+                         self.join(e, m.sw, e, e), self.join(m.se, e, e, e))
+
+    def inner(self, m):
+        """Центральный квадрат уровня k-1."""
+        return self.join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+    def successor(self, m, j):
+        """
+        Центр узла m (уровень k ≥ 2) через 2^j поколений, j ≤ k-2.
+        Результат — узел уровня k-1.
+        """
+        j = min(j, m.level - 2)
+        if m.pop == 0:
+            return m.nw
+        key = (m, j)
+        res = self._results.get(key)
+        if res is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return res
+        self.misses += 1
+
+        if m.level == 2:
+            res = self._base[m.code]
+        else:
+            a, b, c, d = m.nw, m.ne, m.sw, m.se
+            join, succ = self.join, self.successor
+            # девять перекрывающихся квадратов уровня k-1
+            c1 = succ(a, j)
+            c2 = succ(join(a.ne, b.nw, a.se, b.sw), j)
+            c3 = succ(b, j)
+            c4 = succ(join(a.sw, a.se, c.nw, c.ne), j)
+            c5 = succ(join(a.se, b.sw, c.ne, d.nw), j)
+            c6 = succ(join(b.sw, b.se, d.nw, d.ne), j)
+            c7 = succ(c, j)
+            c8 = succ(join(c.ne, d.nw, c.se, d.sw), j)
+            c9 = succ(d, j)
+            if j < m.level - 2:
+                # уже продвинулись на 2^j — остаётся взять центры
+                res = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                           join(c2.se, c3.sw, c5.ne, c6.nw),
+                           join(c4.se, c5.sw, c7.ne, c8.nw),
+                           join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                # вторая половина шага
+                res = join(succ(join(c1, c2, c4, c5), j),
+                           succ(join(c2, c3, c5, c6), j),
+                           succ(join(c4, c5, c7, c8), j),
+                           succ(join(c5, c6, c8, c9), j))
+
+        self._results[key] = res
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return res
+
+    def stats(self):
+        return {"nodes": len(self._nodes), "results": len(self._results),
+                "hits": self.hits, "misses": self.misses}
+
+    # ====== Перевод между NumPy и деревом ======
+
+    def from_array(self, a):
+        """
+        Квадратный массив 2^k × 2^k (k ≥ 2) → узел уровня k.
+        Строим снизу вверх: на каждом уровне join вызывается только
+        для уникальных четвёрок детей, поэтому повторяющиеся области почти бесплатны.
+        """
+        a = np.asarray(a) != 0
+        size = a.shape[0]
+        # коды блоков 4×4
+        blocks = a.reshape(size // 4, 4, size // 4, 4).transpose(0, 2, 1, 3).reshape(size // 4, size // 4, 16)
+        codes = (blocks.astype(np.int64) << np.arange(16)).sum(axis=2)
+        uniq, ids = np.unique(codes, return_inverse=True)
+        level1 = self._level1
+        nodes = [self.join(level1[c & 0x33], level1[c >> 2 & 0x33],
+                           level1[c >> 8 & 0x33], level1[c >> 10 & 0x33]) for c in uniq.tolist()]
+        ids = ids.reshape(codes.shape)
+
+        while ids.shape[0] > 1:
+            m = ids.shape[0] // 2
+            quads = ids.reshape(m, 2, m, 2).transpose(0, 2, 1, 3).reshape(-1, 4)
+            u = len(nodes)
+            if u ** 4 < 1 << 63:
+                # четвёрку детей кодируем одним числом — np.unique по 1-D массиву намного быстрее
+                keys = ((quads[:, 0] * u + quads[:, 1]) * u + quads[:, 2]) * u + quads[:, 3]
+                first, inv = np.unique(keys, return_index=True, return_inverse=True)[1:]
+                uniq = quads[first]
+            else:
+                uniq, inv = np.unique(quads, axis=0, return_inverse=True)
+            nodes = [self.join(nodes[q0], nodes[q1], nodes[q2], nodes[q3]) for q0, q1, q2, q3 in uniq.tolist()]
+            ids = inv.reshape(m, m)
+        return nodes[int(ids[0, 0])]
+
+    def to_array(self, node):
+        """Узел уровня k ≥ 2 → массив 0/1 2^k × 2^k (сверху вниз, по уникальным узлам уровня)."""
+        nodes = [node]
+        ids = np.zeros((1, 1), dtype=np.int64)
+        while nodes[0].level > 2:
+            index, children, table = {}, [], []
+            for n in nodes:
+                row = []
+                for child in (n.nw, n.ne, n.sw, n.se):
+                    k = index.get(id(child))
+                    if k is None:
+                        k = index[id(child)] = len(children)
+                        children.append(child)
+                    row.append(k)
+                table.append(row)
+            m = ids.shape[0]
+            ids = np.asarray(table)[ids].reshape(m, m, 2, 2).transpose(0, 2, 1, 3).reshape(2 * m, 2 * m)
+            nodes = children
+        codes = np.array([n.code for n in nodes])
+        cells = ((codes[:, None] >> np.arange(16)) & 1).reshape(-1, 4, 4).astype(np.uint8)
+        m = ids.shape[0]
+        return cells[ids].transpose(0, 2, 1, 3).reshape(4 * m, 4 * m)
+
+
+def _level_for(size):
+    k = 2
+    while (1 << k) < size:
+        k += 1
+    return k
+
+
+class HashlifeBoard:
+    """
+    Доска «Игры Жизнь» поверх Hashlife с переводом из/в NumPy-сетку.
+    torus=True — границы соединены, как в game.py (стороны должны быть степенями двойки);
+    torus=False — доска лежит на бесконечной пустой плоскости, а grid показывает
+    исходное окно N × M.
+    """
+
+    def __init__(self, grid, torus=True, universe=None):
+        grid = np.asarray(grid)
+        self.shape = grid.shape
+        self.torus = torus
+        self.u = universe if universe is not None else Hashlife()
+        self.generation = 0
+        n, m = self.shape
+        self.level = _level_for(max(n, m))
+        if torus:
+            if n & (n - 1) or m & (m - 1) or min(n, m) < 4:
+                raise ValueError("для torus=True стороны доски должны быть степенями двойки ≥ 4")
+            # периодическая мозаика доски в квадрате 2^level
+            size = 1 << self.level
+            self.root = self.u.from_array(np.tile(grid, (size // n, size // m)))
+            self.origin = (0, 0)
+        else:
+            size = 1 << self.level
+            padded = np.zeros((size, size), dtype=np.uint8)
+            padded[:n, :m] = grid != 0
+            self.root = self.u.from_array(padded)
+            self.origin = (0, 0)   # координаты левого верхнего угла корня
+
+    @property
+    def population(self):
+        return self.root.pop
+
+    def jump(self, j):
+        """Продвигает доску на 2^j поколений."""
+        if self.torus:
+            self._jump_torus(j)
+        else:
+            self._jump_plane(j)
+        self.generation += 1 << j
+        return self
+
+    def advance(self, generations):
+        """Продвигает доску на произвольное число поколений (по двоичным разрядам)."""
+        j = 0
+        while generations:
+            if generations & 1:
+                self.jump(j)
+            generations >>= 1
+            j += 1
+        return self
+
+    def _jump_torus(self, j):
+        # мозаика из копий тора — канонический узел, строится за O(уровень)
+        k = self.level
+        top = max(k + 1, j + 1)
+        tile = self.root
+        for _ in range(top + 1 - k):
+            tile = self.u.join(tile, tile, tile, tile)
+        res = self.u.successor(tile, j)
+        # центр смещён на 2^(top-1) — кратно периоду, значит левый верхний угол совпадает с доской
+        while res.level > k:
+            res = res.nw
+        self.root = res
+
+    def _jump_plane(self, j):
+        u = self.u
+        root = self.root
+        r0, c0 = self.origin
+        # запас пустоты вокруг, чтобы узор не вышел за результат
+        while root.level < j + 2 or u.inner(u.inner(root)).pop != root.pop:
+            half = 1 << (root.level - 1)
+            root = u.centre(root)
+            r0, c0 = r0 - half, c0 - half
+        half = 1 << (root.level - 1)
+        root = u.centre(root)
+        r0, c0 = r0 - half, c0 - half
+        quarter = 1 << (root.level - 2)
+        root = u.successor(root, j)
+        r0, c0 = r0 + quarter, c0 + quarter
+        # убираем пустые края
+        while root.level > self.level and u.inner(root).pop == root.pop:
+            quarter = 1 << (root.level - 2)
+            root = u.inner(root)
+            r0, c0 = r0 + quarter, c0 + quarter
+        self.root, self.origin = root, (r0, c0)
+
+    @property
+    def grid(self):
+        """Текущее состояние как NumPy-сетка исходного размера."""
+        n, m = self.shape
+        if self.torus:
+            return self.u.to_array(self.root)[:n, :m]
+        out = np.zeros((n, m), dtype=np.uint8)
+        if self.root.pop == 0:
+            return out
+        arr = self.u.to_array(self.root)
+        r0, c0 = self.origin
+        size = arr.shape[0]
+        rs, cs = max(0, r0), max(0, c0)
+        re, ce = min(n, r0 + size), min(m, c0 + size)
+        if rs < re and cs < ce:
+            out[rs:re, cs:ce] = arr[rs - r0:re - r0, cs - c0:ce - c0]
+        return out
+
+
+if __name__ == "__main__":
+    # сверка с векторным движком life.step на торе
+    import life
+
+    rng = np.random.default_rng(0)
+    g = rng.choice([0, 1], size=(64, 32), p=[0.7, 0.3]).astype(np.uint8)
+    board = HashlifeBoard(g)
+    ref = g
+    for gens in [1, 2, 3, 8, 100]:
+        for _ in range(gens):
+            ref = life.step(ref)
+        board.advance(gens)
+        assert np.array_equal(board.grid, ref), gens
+    print("тор 64×32: совпадает с life.step,", board.u.stats())
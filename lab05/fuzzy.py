@@ -0,0 +1,248 @@
+import json
+
+import numpy as np
+
+
+# ====== ФУНКЦИИ ПРИНАДЛЕЖНОСТИ ======
+# Все принимают x формы (S, 1) и параметры формы (k,) — сразу k термов.
+def trimf(x, a, b, c):
+    # a == b или b == c — «плечо», как у trapmf; иначе обычная формула треугольника
+    with np.errstate(divide="ignore", invalid="ignore"):
+        left = np.where(b > a, (x - a) / (b - a), np.where(x >= a, 1.0, 0.0))
+        right = np.where(c > b, (c - x) / (c - b), np.where(x <= c, 1.0, 0.0))
+    return np.maximum(np.minimum(left, right), 0)
+
+
+def trapmf(x, a, b, c, d):
+    # a == b или c == d — «плечо»: левая/правая сторона равна 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        left = np.where(b > a, (x - a) / (b - a), np.where(x >= a, 1.0, 0.0))
+        right = np.where(d > c, (d - x) / (d - c), np.where(x <= d, 1.0, 0.0))
+    return np.maximum(np.minimum(np.minimum(left, right), 1), 0)
+
+
+def gaussmf(x, mean, sigma):
+    return np.exp(-0.5 * ((x - mean) / sigma) ** 2)
+
+
+MEMBERSHIP = {
+    "tri": (trimf, 3),
+    "trap": (trapmf, 4),
+    "gauss": (gaussmf, 2),
+}
+
+
+def check_term(where, spec):
+    """Проверка терма конфига: известный тип, число и порядок параметров."""
+    kind, params = spec["type"], spec["params"]
+    if kind not in MEMBERSHIP:
+        raise ValueError(f"{where}: неизвестный тип терма {kind}")
+    if len(params) != MEMBERSHIP[kind][1]:
+        raise ValueError(f"{where}: для {kind} нужно {MEMBERSHIP[kind][1]} параметра")
+    if kind == "gauss":
+        if not params[1] > 0:
+            raise ValueError(f"{where}: sigma должна быть больше нуля")
+    elif list(params) != sorted(params) or params[0] == params[-1]:
+        raise ValueError(f"{where}: параметры {kind} должны возрастать и задавать ненулевую ширину")
+
+
+def membership(x, spec):
+    """Степень принадлежности x терму spec из конфига ({"type": ..., "params": [...]})."""
+    return MEMBERSHIP[spec["type"]][0](x, *spec["params"])
+
+
+class FuzzyEngine:
+    """
+    Нечёткая модель Мамдани, целиком заданная конфигом (см. sunburn.json):
+    входные переменные с термами tri / trap / gauss, выходная переменная
+    и база правил. Новое правило или терм — правка конфига, не кода.
+
+    Правило — список термов по порядку входов и выходной терм в конце,
+    либо {"if": {"переменная": "терм", ...}, "then": "терм"}; не указанная
+    в "if" переменная в правиле не участвует.
+
+    При сборке все термы всех входов сводятся в одну таблицу степеней
+    принадлежности (S, K + 1), где последний столбец — единицы для «любой».
+    Тогда сила всех правил — одно взятие по индексам и min по оси условий.
+
+    Дефаззификация:
+      "weighted" — взвешенное среднее уровней (level) выходных термов, как в model.py;
+      "centroid" — центр тяжести объединения срезанных выходных термов
+                   на сетке из resolution точек.
+    """
+
+    def __init__(self, config, defuzzifier="weighted", resolution=201):
+        if defuzzifier not in ("weighted", "centroid"):
+            raise ValueError(f"неизвестный способ дефаззификации: {defuzzifier}")
+        self.config = config
+        self.defuzzifier = defuzzifier
+        self.inputs = list(config["inputs"])
+        self.output = config["output"]
+        self.output_terms = list(self.output["terms"])
+        self._compile_inputs()
+        self._compile_rules(config["rules"])
+        self._compile_output(resolution)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    # ---------- сборка ----------
+    def _compile_inputs(self):
+        """Термы группируются по (переменная, тип), параметры — столбцами массивов."""
+        self.term_index = {}       # (переменная, терм) → столбец общей таблицы
+        self.groups = []           # (номер входа, функция, параметры, столбцы)
+        col = 0
+        for v, name in enumerate(self.inputs):
+            by_type = {}
+            for term, spec in self.config["inputs"][name]["terms"].items():
+                check_term(f"{name}/{term}", spec)
+                kind = spec["type"]
+                self.term_index[name, term] = col
+                by_type.setdefault(kind, []).append((col, spec["params"]))
+                col += 1
+            for kind, items in by_type.items():
+                cols = np.array([c for c, _ in items], dtype=np.intp)
+                params = np.array([p for _, p in items], dtype=float).T
+                self.groups.append((v, MEMBERSHIP[kind][0], tuple(params), cols))
+        self.n_terms = col         # столбец n_terms — единицы
+
+    def _compile_rules(self, rules):
+        """Правила → (R, число входов) индексов в таблицу и номер выходного терма."""
+        cond, out = [], []
+        self.rules = []            # (условия {переменная: терм}, выходной терм) в порядке конфига
+        for k, rule in enumerate(rules):
+            if isinstance(rule, dict):
+                when, then = rule["if"], rule["then"]
+                unknown = set(when) - set(self.inputs)
+                if unknown:
+                    raise ValueError(f"правило {k}: неизвестные переменные {sorted(unknown)}")
+            else:
+                if len(rule) != len(self.inputs) + 1:
+                    raise ValueError(f"правило {k}: ожидается {len(self.inputs) + 1} термов")
+                when, then = dict(zip(self.inputs, rule[:-1])), rule[-1]
+            try:
+                cond.append([self.term_index[name, when[name]] if name in when else self.n_terms
+                             for name in self.inputs])
+                out.append(self.output_terms.index(then))
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"правило {k}: неизвестный терм {e}") from None
+            self.rules.append((dict(when), then))
+
+        cond = np.array(cond, dtype=np.intp).reshape(-1, len(self.inputs))
+        out = np.array(out, dtype=np.intp)
+        # сортировка по выходу — максимум по каждому выходу одним reduceat
+        self.order = np.argsort(out, kind="stable")
+        self.cond = cond[self.order]
+        self.present, self.starts = np.unique(out[self.order], return_index=True)
+
+    def _compile_output(self, resolution):
+        terms = self.output["terms"]
+        lo, hi = self.output["range"]
+        for t in self.output_terms:
+            check_term(f"{self.output.get('name', 'выход')}/{t}", terms[t])
+        self.levels = np.array([self._level(terms[t]) for t in self.output_terms], dtype=float)
+        # выходные термы на сетке для центроида: (T, P)
+        self.z = np.linspace(lo, hi, resolution)
+        self.out_mf = np.empty((len(self.output_terms), resolution))
+        for i, t in enumerate(self.output_terms):
+            self.out_mf[i] = membership(self.z, terms[t])
+
+    @staticmethod
+    def _level(spec):
+        """Уровень выхода для взвешенного среднего: явный level или вершина терма."""
+        if "level" in spec:
+            return spec["level"]
+        p = spec["params"]
+        return {"tri": lambda: p[1], "trap": lambda: (p[1] + p[2]) / 2, "gauss": lambda: p[0]}[spec["type"]]()
+
+    # ---------- расчёт ----------
+    def memberships(self, *inputs):
+        """Таблица степеней принадлежности (S, K + 1) для одномерных входов длины S."""
+        mu = np.empty((inputs[0].size, self.n_terms + 1))
+        mu[:, self.n_terms] = 1
+        for v, func, params, cols in self.groups:
+            mu[:, cols] = func(inputs[v][:, None], *params)
+        return mu
+
+    def _defuzzify(self, act):
+        if self.defuzzifier == "weighted":
+            num = act @ self.levels
+            den = act.sum(axis=1)
+        else:
+            # объединение (max) срезанных (min) выходных термов: (S, P)
+            agg = np.minimum(act[:, :, None], self.out_mf).max(axis=1)
+            num = agg @ self.z
+            den = agg.sum(axis=1)
+        return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+    def evaluate(self, *inputs, chunk=1 << 14, return_rules=False):
+        """
+        Выход модели для массивов входов (по порядку self.inputs, с broadcasting).
+        Возвращает crisp и активации выходных термов (..., T);
+        с return_rules=True — ещё силу каждого правила (..., R) в порядке конфига.
+        """
+        if len(inputs) != len(self.inputs):
+            raise ValueError(f"ожидается {len(self.inputs)} входов: {', '.join(self.inputs)}")
+        inputs = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in inputs))
+        shape = inputs[0].shape
+        inputs = [x.ravel() for x in inputs]
+        s, n_rules, n_out = inputs[0].size, len(self.order), len(self.output_terms)
+
+        crisp = np.empty(s)
+        act = np.zeros((s, n_out))
+        alpha_all = np.empty((s, n_rules)) if return_rules else None
+
+        for lo in range(0, s, chunk):
+            hi = min(lo + chunk, s)
+            mu = self.memberships(*(x[lo:hi] for x in inputs))
+            alpha = mu[:, self.cond].min(axis=2)          # (s, R)
+            if n_rules:
+                act[lo:hi, self.present] = np.maximum.reduceat(alpha, self.starts, axis=1)
+            if return_rules:
+                alpha_all[lo:hi, self.order] = alpha
+            crisp[lo:hi] = self._defuzzify(act[lo:hi])
+
+        crisp = crisp.reshape(shape)
+        act = act.reshape(shape + (n_out,))
+        if return_rules:
+            return crisp, act, alpha_all.reshape(shape + (n_rules,))
+        return crisp, act
+
+    def __call__(self, **inputs):
+        """Один расчёт по именам входов: engine(temp=28, uv=7, hum=40) → float."""
+        crisp, _ = self.evaluate(*(inputs[name] for name in self.inputs))
+        return float(crisp)
+
+
+if __name__ == "__main__":
+    import os
+
+    import reference
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sunburn.json")
+    engine = FuzzyEngine.from_file(path)
+    rng = np.random.default_rng(0)
+    # чуть шире диапазонов: за краями термов тоже должно совпадать
+    t, u, h = rng.uniform(-12, 42, 200_000), rng.uniform(-1, 12, 200_000), rng.uniform(-5, 105, 200_000)
+    crisp, act = engine.evaluate(t, u, h)
+    # замороженная исходная модель с зашитыми термами, правилами и уровнями
+    ref, ref_act = reference.evaluate(t, u, h)
+    assert np.array_equal(crisp, ref) and np.array_equal(act, ref_act)
+    print("weighted: sunburn.json + FuzzyEngine совпадают с исходной моделью до бита")
+
+    shoulder = FuzzyEngine({
+        "inputs": {"x": {"terms": {"мало": {"type": "tri", "params": [0, 0, 10]},
+                                   "много": {"type": "trap", "params": [0, 10, 20, 20]}}}},
+        "output": {"range": [0, 1], "terms": {"нет": {"type": "tri", "params": [0, 0, 1]},
+                                              "да": {"type": "tri", "params": [0, 1, 1]}}},
+        "rules": [["мало", "нет"], ["много", "да"]],
+    })
+    assert shoulder(x=0.0) == 0.0 and shoulder(x=20.0) == 1.0
+    print("плечи треугольников: без деления на ноль")
+
+    centroid = FuzzyEngine.from_file(path, defuzzifier="centroid")
+    for x in [(28, 7, 40), (15, 5, 50), (0, 1, 70)]:
+        print(f"{x}: взвешенное {engine(temp=x[0], uv=x[1], hum=x[2]):.1f}, "
+              f"центроид {centroid(temp=x[0], uv=x[1], hum=x[2]):.1f}")
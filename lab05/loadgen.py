@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+import model
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    data = json.loads(await reader.readexactly(length))
+    if not status.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(f"{status.decode().strip()}: {data}")
+    return data
+
+
+async def _stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await _request(reader, writer, "GET", "/stats")
+    finally:
+        writer.close()
+
+
+async def _client(host, port, points, latencies):
+    """Одно keep-alive соединение, запросы по очереди."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for p in points:
+            t0 = time.perf_counter()
+            await _request(reader, writer, "POST", "/score", dict(zip(model.INPUTS, p)))
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def run(host="127.0.0.1", port=8765, requests=20_000, concurrency=64, seed=0):
+    """
+    concurrency клиентов шлют всего requests одиночных запросов.
+    Возвращает (статистика клиента, /stats сервера).
+    """
+    rng = np.random.default_rng(seed)
+    pts = np.column_stack([rng.uniform(*model.CONFIG["inputs"][name]["range"], requests)
+                           for name in model.INPUTS]).tolist()
+    latencies = []
+    before = await _stats(host, port)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, pts[i::concurrency], latencies) for i in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    server = await _stats(host, port)
+
+    lat = np.array(latencies) * 1000
+    client = {
+        "requests": len(lat),
+        "seconds": elapsed,
+        "requests_per_s": len(lat) / elapsed,
+        "latency_ms": dict(zip(("p50", "p95", "p99"), np.percentile(lat, [50, 95, 99]).tolist())),
+        # средний размер пачки на сервере именно за этот прогон
+        "mean_batch": (server["points"] - before["points"]) / max(1, server["batches"] - before["batches"]),
+    }
+    return client, server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест server.py на localhost")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    args = parser.parse_args()
+
+    print(f"{'клиентов':>8} {'запр/с':>9} {'p50 мс':>8} {'p95 мс':>8} {'p99 мс':>8} {'ср. пачка':>10}")
+    for c in args.concurrency:
+        client, server = asyncio.run(run(args.host, args.port, args.requests, c))
+        lat = client["latency_ms"]
+        print(f"{c:>8} {client['requests_per_s']:>9.0f} {lat['p50']:>8.2f} {lat['p95']:>8.2f} "
+              f"{lat['p99']:>8.2f} {client['mean_batch']:>10.1f}", flush=True)
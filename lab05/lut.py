@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+import model
+
+# Область определения входов: температура, UV-индекс, влажность (диапазоны из конфига)
+BOUNDS = tuple(tuple(model.CONFIG["inputs"][name]["range"]) for name in model.INPUTS)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+def model_key():
+    """Отпечаток модели: при изменении термов или правил кеш на диске пересчитывается."""
+    text = json.dumps(model.CONFIG, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+class RiskTable:
+    """
+    Предвычисленная поверхность риска на сетке shape = (nt, nu, nh).
+    Запрос — трилинейная интерполяция по 8 соседним узлам, время не зависит от модели.
+    Входы за пределами BOUNDS прижимаются к границе.
+
+    На гранях области (например, UV = 0 или влажность = 100) ни одно правило
+    не срабатывает и модель скачком даёт 0. Поэтому в граничных узлах хранится
+    предел изнутри, а точки ровно на грани считаются точно.
+    """
+
+    def __init__(self, values, bounds=BOUNDS):
+        self.values = np.asarray(values, dtype=float)
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.shape = np.array(self.values.shape)
+
+    @classmethod
+    def build(cls, shape=(101, 111, 101), bounds=BOUNDS):
+        """Считает модель один раз во всех узлах сетки (пакетно)."""
+        axes = []
+        for (lo, hi), n in zip(bounds, shape):
+            x = np.linspace(lo, hi, n)
+            # граничные узлы чуть сдвигаем внутрь — берём предел, а не скачок на грани
+            eps = (hi - lo) * 1e-9
+            x[0], x[-1] = lo + eps, hi - eps
+            axes.append(x)
+        t, u, h = np.meshgrid(*axes, indexing="ij")
+        crisp, _ = model.evaluate_batch(t, u, h)
+        return cls(crisp, bounds)
+
+    @classmethod
+    def load(cls, shape=(101, 111, 101), bounds=BOUNDS, cache_dir=CACHE_DIR):
+        """Таблица из кеша на диске; если её нет или модель изменилась — строит и сохраняет."""
+        name = "risk_{}_{}.npz".format("x".join(map(str, shape)), model_key())
+        path = os.path.join(cache_dir, name)
+        if os.path.exists(path):
+            data = np.load(path)
+            if np.array_equal(data["bounds"], np.asarray(bounds, dtype=float)):
+                return cls(data["values"], data["bounds"])
+        table = cls.build(shape, bounds)
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, values=table.values, bounds=table.bounds)
+        return table
+
+    def __call__(self, temp, uv, hum):
+        """Риск для массивов входов (трилинейная интерполяция)."""
+        temp, uv, hum = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (temp, uv, hum)))
+        idx, frac, edge, clipped = [], [], np.zeros(temp.shape, dtype=bool), []
+        for x, (lo, hi), n in zip((temp, uv, hum), self.bounds, self.shape):
+            x = np.clip(x, lo, hi)
+            clipped.append(x)
+            edge |= (x == lo) | (x == hi)
+            pos = (x - lo) / (hi - lo) * (n - 1)
+            i = np.minimum(pos.astype(np.intp), n - 2)
+            idx.append(i)
+            frac.append(pos - i)
+        (i, j, k), (ft, fu, fh) = idx, frac
+        v = self.values
+        # интерполяция сначала по влажности, затем по UV, затем по температуре
+        c00 = v[i, j, k] * (1 - fh) + v[i, j, k + 1] * fh
+        c01 = v[i, j + 1, k] * (1 - fh) + v[i, j + 1, k + 1] * fh
+        c10 = v[i + 1, j, k] * (1 - fh) + v[i + 1, j, k + 1] * fh
+        c11 = v[i + 1, j + 1, k] * (1 - fh) + v[i + 1, j + 1, k + 1] * fh
+        c0 = c00 * (1 - fu) + c01 * fu
+        c1 = c10 * (1 - fu) + c11 * fu
+        risk = c0 * (1 - ft) + c1 * ft
+        if edge.any():
+            risk = np.array(risk)
+            risk[edge], _ = model.evaluate_batch(*(x[edge] for x in clipped))
+        return risk
+
+    def max_error(self, samples=200_000, seed=0):
+        """
+        Наибольшее и среднее отклонение от точного расчёта.
+        Проверяются случайные точки и центры случайных ячеек сетки (там ошибка интерполяции наибольшая).
+        """
+        rng = np.random.default_rng(seed)
+        lo, hi = self.bounds[:, 0], self.bounds[:, 1]
+        step = (hi - lo) / (self.shape - 1)
+        cells = rng.integers(0, self.shape - 1, size=(samples, 3))
+        # плюс точки на гранях, где модель разрывна
+        faces = lo + rng.random((samples // 10, 3)) * (hi - lo)
+        axis = rng.integers(0, 3, len(faces))
+        faces[np.arange(len(faces)), axis] = np.where(rng.random(len(faces)) < 0.5, lo[axis], hi[axis])
+        points = [lo + rng.random((samples, 3)) * (hi - lo), lo + (cells + 0.5) * step, faces]
+        pts = np.concatenate(points)
+        exact, _ = model.evaluate_batch(pts[:, 0], pts[:, 1], pts[:, 2])
+        err = np.abs(self(pts[:, 0], pts[:, 1], pts[:, 2]) - exact)
+        return float(err.max()), float(err.mean())
+
+
+if __name__ == "__main__":
+    import time
+
+    for shape in [(26, 23, 26), (51, 45, 51), (101, 111, 101), (201, 221, 201)]:
+        t0 = time.perf_counter()
+        table = RiskTable.load(shape)
+        built = time.perf_counter() - t0
+        worst, mean = table.max_error(50_000)
+        t = np.random.default_rng(1).uniform(-10, 40, 1_000_000)
+        t0 = time.perf_counter()
+        table(t, 5.0, 50.0)
+        query = time.perf_counter() - t0
+        print(f"сетка {shape}: загрузка {built:.2f} c, макс. ошибка {worst:.3f}, "
+              f"средняя {mean:.4f}, 1e6 запросов {query:.3f} c")
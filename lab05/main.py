@@ -1,89 +1,86 @@
+import threading
+import time
+
 import streamlit as st
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
-# ====== 1. ТРЕУГОЛЬНЫЕ ФУНКЦИИ ПРИНАДЛЕЖНОСТИ ======
-def trimf(x, a, b, c):
-    return np.maximum(np.minimum((x - a) / (b - a), (c - x) / (c - b)), 0)
-
-# --- Температура (°C)
-def temp_low(x): return trimf(x, -10, 0, 10)
-def temp_med(x): return trimf(x, 5, 15, 25)
-def temp_high(x): return trimf(x, 20, 30, 40)
-
-# --- UV (индекс 0–11)
-def uv_low(x): return trimf(x, 0, 1, 3)
-def uv_mod(x): return trimf(x, 2, 5, 7)
-def uv_high(x): return trimf(x, 6, 8, 10)
-def uv_ext(x): return trimf(x, 9, 11, 12)
-
-# --- Влажность (%)
-def hum_low(x): return trimf(x, 0, 30, 60)
-def hum_high(x): return trimf(x, 40, 70, 100)
-
-# ====== 2. БАЗА ПРАВИЛ ======
-rules = [
-    ("низкая","низкий","низкая","низкий"),
-    ("низкая","низкий","высокая","низкий"),
-    ("низкая","умеренный","низкая","средний"),
-    ("низкая","умеренный","высокая","низкий"),
-    ("низкая","высокий","низкая","высокий"),
-    ("низкая","высокий","высокая","средний"),
-    ("низкая","экстремальный","низкая","высокий"),
-    ("низкая","экстремальный","высокая","высокий"),
-    ("средняя","низкий","низкая","низкий"),
-    ("средняя","низкий","высокая","низкий"),
-    ("средняя","умеренный","низкая","средний"),
-    ("средняя","умеренный","высокая","средний"),
-    ("средняя","высокий","низкая","высокий"),
-    ("средняя","высокий","высокая","высокий"),
-    ("средняя","экстремальный","низкая","высокий"),
-    ("средняя","экстремальный","высокая","высокий"),
-    ("высокая","низкий","низкая","низкий"),
-    ("высокая","низкий","высокая","низкий"),
-    ("высокая","умеренный","низкая","средний"),
-    ("высокая","умеренный","высокая","средний"),
-    ("высокая","высокий","низкая","высокий"),
-    ("высокая","высокий","высокая","высокий"),
-    ("высокая","экстремальный","низкая","высокий"),
-    ("высокая","экстремальный","высокая","высокий"),
-]
-
-risk_levels = {"низкий": 20, "средний": 50, "высокий": 80}
-
-# ====== 3. ФАЗЗИФИКАЦИЯ ======
-def fuzzify(temp, uv, hum):
-    μ_temp = {"низкая": temp_low(temp), "средняя": temp_med(temp), "высокая": temp_high(temp)}
-    μ_uv = {"низкий": uv_low(uv), "умеренный": uv_mod(uv), "высокий": uv_high(uv), "экстремальный": uv_ext(uv)}
-    μ_hum = {"низкая": hum_low(hum), "высокая": hum_high(hum)}
-    return μ_temp, μ_uv, μ_hum
-
-# ====== 4. ПРИМЕНЕНИЕ ПРАВИЛ ======
-def apply_rules(μ_temp, μ_uv, μ_hum):
-    result = {"низкий": 0, "средний": 0, "высокий": 0}
-    for t, u, h, r in rules:
-        α = min(μ_temp[t], μ_uv[u], μ_hum[h])
-        result[r] = max(result[r], α)
-    return result
-
-# ====== 5. ДЕФАЗЗИФИКАЦИЯ ======
-def defuzzify(risks):
-    num = sum(risks[k] * risk_levels[k] for k in risks)
-    den = sum(risks.values())
-    return num / den if den != 0 else 0
+from fuzzy import membership
+from model import CONFIG, INPUTS, TERMS, fuzzify, apply_rules, defuzzify
+
+# Бюджет на один запрос (расчёт + отрисовка), мс — для панели отладки
+LATENCY_BUDGET_MS = 50
+
+# Панели графиков и ползунки — по входам из конфига
+PANELS = [(CONFIG["inputs"][name]["label"], TERMS[name], tuple(CONFIG["inputs"][name]["range"]))
+          for name in INPUTS]
+
+
+# ====== ГРАФИКИ (общие для всех сессий) ======
+@st.cache_data
+def membership_curves(n=200):
+    """Кривые принадлежности всех термов: считаются векторно один раз на процесс."""
+    curves = []
+    for title, terms, (lo, hi) in PANELS:
+        x = np.linspace(lo, hi, n)
+        curves.append((title, x, {name: membership(x, spec) for name, spec in terms.items()}))
+    return curves
+
+
+@st.cache_resource
+def base_figure():
+    """
+    Фигура с кривыми рисуется один раз на процесс, фон осей запоминается.
+    На запрос восстанавливается фон и дорисовываются только красные маркеры (blitting).
+    Фигура общая для всех сессий, поэтому перерисовка идёт под замком.
+    """
+    fig, axs = plt.subplots(1, len(PANELS), figsize=(5 * len(PANELS), 4), squeeze=False)
+    axs = axs[0]
+    markers = []
+    for ax, (title, x, curves) in zip(axs, membership_curves()):
+        for name, y in curves.items():
+            ax.plot(x, y, label=name)
+        # animated — линия не попадает в фон при canvas.draw()
+        markers.append(ax.axvline(x[0], color='r', linestyle='--', animated=True))
+        ax.set_title(title)
+        ax.legend()
+    fig.canvas.draw()
+    backgrounds = [fig.canvas.copy_from_bbox(ax.bbox) for ax in axs]
+    return fig, list(zip(axs, backgrounds, markers)), threading.Lock()
+
+
+def render(values):
+    """Картинка (H, W, 4) с маркерами в точках values."""
+    fig, panels, lock = base_figure()
+    canvas = fig.canvas
+    with lock:
+        for (ax, background, line), v in zip(panels, values):
+            canvas.restore_region(background)
+            line.set_xdata([v, v])
+            ax.draw_artist(line)
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def slider(title, lo, hi):
+    """Ползунок по диапазону из конфига; середина — того же типа, что границы (int или float)."""
+    kind = float if isinstance(lo, float) or isinstance(hi, float) else int
+    return st.slider(title, kind(lo), kind(hi), kind((lo + hi) / 2))
+
 
 # ====== 6. ЛОГИКА ПРОГРАММЫ ======
 st.title("Прогноз риска солнечного ожога")
 st.write("Введите значения для температуры, UV-индекса и влажности:")
 
-temp = st.slider("Температура (°C)", -10, 40, 15)
-uv = st.slider("UV-индекс", 0, 11, 5)
-hum = st.slider("Влажность (%)", 0, 100, 50)
+values = [slider(title, lo, hi) for title, _, (lo, hi) in PANELS]
 
 if st.button("Рассчитать риск"):
-    μ_temp, μ_uv, μ_hum = fuzzify(temp, uv, hum)
-    fuzzy_out = apply_rules(μ_temp, μ_uv, μ_hum)
+    t0 = time.perf_counter()
+    μ = fuzzify(*values)
+    fuzzy_out = apply_rules(*μ)
     crisp = defuzzify(fuzzy_out)
+    t_model = time.perf_counter()
 
     # Интерпретация
     if crisp < 30:
@@ -98,42 +95,22 @@ if st.button("Рассчитать риск"):
     st.write(msg)
 
     st.write("Степени принадлежности:")
-    st.json({
-        "Температура": μ_temp,
-        "UV": μ_uv,
-        "Влажность": μ_hum,
-    })
+    st.json({title: {k: float(v) for k, v in mu.items()} for (title, _, _), mu in zip(PANELS, μ)})
 
     # ====== ГРАФИКИ ======
     st.subheader("Функции принадлежности")
-
-    fig, axs = plt.subplots(1, 3, figsize=(15, 4))
-
-    # Температура
-    x = np.linspace(-10, 40, 200)
-    axs[0].plot(x, [temp_low(i) for i in x], label="низкая")
-    axs[0].plot(x, [temp_med(i) for i in x], label="средняя")
-    axs[0].plot(x, [temp_high(i) for i in x], label="высокая")
-    axs[0].axvline(temp, color='r', linestyle='--')
-    axs[0].set_title("Температура (°C)")
-    axs[0].legend()
-
-    # UV
-    x = np.linspace(0, 11, 200)
-    axs[1].plot(x, [uv_low(i) for i in x], label="низкий")
-    axs[1].plot(x, [uv_mod(i) for i in x], label="умеренный")
-    axs[1].plot(x, [uv_high(i) for i in x], label="высокий")
-    axs[1].plot(x, [uv_ext(i) for i in x], label="экстремальный")
-    axs[1].axvline(uv, color='r', linestyle='--')
-    axs[1].set_title("UV-индекс")
-    axs[1].legend()
-
-    # Влажность
-    x = np.linspace(0, 100, 200)
-    axs[2].plot(x, [hum_low(i) for i in x], label="низкая")
-    axs[2].plot(x, [hum_high(i) for i in x], label="высокая")
-    axs[2].axvline(hum, color='r', linestyle='--')
-    axs[2].set_title("Влажность (%)")
-    axs[2].legend()
-
-    st.pyplot(fig)
\ No newline at end of file
+    st.image(render(values))
+    t_end = time.perf_counter()
+
+    # ====== ОТЛАДКА ======
+    total = (t_end - t0) * 1000
+    history = st.session_state.setdefault("latency_ms", [])
+    history.append(total)
+    with st.expander("Отладка: время запроса"):
+        st.write(f"модель: {(t_model - t0) * 1000:.2f} мс, "
+                 f"графики: {(t_end - t_model) * 1000:.2f} мс, "
+                 f"всего: {total:.2f} мс (бюджет {LATENCY_BUDGET_MS} мс)")
+        if total > LATENCY_BUDGET_MS:
+            st.warning("Бюджет превышен")
+        st.write(f"запросов в сессии: {len(history)}, "
+                 f"медиана {np.median(history):.2f} мс, максимум {max(history):.2f} мс")
@@ -0,0 +1,55 @@
+import json
+import os
+
+from fuzzy import FuzzyEngine, membership
+
+# ====== 1. МОДЕЛЬ ИЗ КОНФИГА ======
+# Термы, база правил и уровни риска задаются в sunburn.json: новое правило
+# или терм — правка конфига, код приложения, сервера и таблицы не меняется.
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sunburn.json")
+with open(CONFIG_PATH, encoding="utf-8") as f:
+    CONFIG = json.load(f)
+
+ENGINE = FuzzyEngine(CONFIG)
+INPUTS = ENGINE.inputs                      # temp, uv, hum
+RISK_NAMES = ENGINE.output_terms
+
+# --- Термы входов: {переменная: {терм: {"type": ..., "params": [...]}}}
+TERMS = {name: CONFIG["inputs"][name]["terms"] for name in INPUTS}
+
+# ====== 2. БАЗА ПРАВИЛ ======
+# (условия {переменная: терм}, выходной терм) в порядке конфига
+rules = ENGINE.rules
+
+risk_levels = dict(zip(RISK_NAMES, ENGINE.levels.tolist()))
+
+# ====== 3. ФАЗЗИФИКАЦИЯ ======
+def fuzzify(*inputs):
+    """Степени принадлежности по входам (в порядке INPUTS): список словарей {терм: μ}."""
+    return [{term: membership(x, spec) for term, spec in TERMS[name].items()}
+            for name, x in zip(INPUTS, inputs)]
+
+# ====== 4. ПРИМЕНЕНИЕ ПРАВИЛ ======
+def apply_rules(*memberships):
+    mu = dict(zip(INPUTS, memberships))
+    result = {name: 0 for name in RISK_NAMES}
+    for when, then in rules:
+        α = min((mu[name][term] for name, term in when.items()), default=1)
+        result[then] = max(result[then], α)
+    return result
+
+# ====== 5. ДЕФАЗЗИФИКАЦИЯ ======
+def defuzzify(risks):
+    num = sum(risks[k] * risk_levels[k] for k in risks)
+    den = sum(risks.values())
+    return num / den if den != 0 else 0
+
+
+# ====== 6. ПАКЕТНЫЙ РАСЧЁТ ======
+def evaluate_batch(*inputs, chunk=1 << 16, return_rules=False):
+    """
+    Пакетный расчёт риска (те же шаги fuzzify → apply_rules → defuzzify, см. FuzzyEngine).
+    Возвращает crisp (S,) и активации выходных термов (S, T) в порядке RISK_NAMES;
+    с return_rules=True — ещё и силу срабатывания каждого правила (S, len(rules)).
+    """
+    return ENGINE.evaluate(*inputs, chunk=chunk, return_rules=return_rules)
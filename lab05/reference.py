@@ -0,0 +1,63 @@
+import numpy as np
+
+# Исходная модель риска ожога с зашитыми параметрами (как была в model.py до перехода
+# на sunburn.json). Не используется приложением — только для сверки FuzzyEngine
+# и конфига с оригиналом: если конфиг разойдётся с ним, проверка в fuzzy.py упадёт.
+
+def trimf(x, a, b, c):
+    return np.maximum(np.minimum((x - a) / (b - a), (c - x) / (c - b)), 0)
+
+TEMP_TERMS = {"низкая": (-10, 0, 10), "средняя": (5, 15, 25), "высокая": (20, 30, 40)}
+UV_TERMS = {"низкий": (0, 1, 3), "умеренный": (2, 5, 7), "высокий": (6, 8, 10), "экстремальный": (9, 11, 12)}
+HUM_TERMS = {"низкая": (0, 30, 60), "высокая": (40, 70, 100)}
+
+rules = [
+    ("низкая","низкий","низкая","низкий"),
+    ("низкая","низкий","высокая","низкий"),
+    ("низкая","умеренный","низкая","средний"),
+    ("низкая","умеренный","высокая","низкий"),
+    ("низкая","высокий","низкая","высокий"),
+    ("низкая","высокий","высокая","средний"),
+    ("низкая","экстремальный","низкая","высокий"),
+    ("низкая","экстремальный","высокая","высокий"),
+    ("средняя","низкий","низкая","низкий"),
+    ("средняя","низкий","высокая","низкий"),
+    ("средняя","умеренный","низкая","средний"),
+    ("средняя","умеренный","высокая","средний"),
+    ("средняя","высокий","низкая","высокий"),
+    ("средняя","высокий","высокая","высокий"),
+    ("средняя","экстремальный","низкая","высокий"),
+    ("средняя","экстремальный","высокая","высокий"),
+    ("высокая","низкий","низкая","низкий"),
+    ("высокая","низкий","высокая","низкий"),
+    ("высокая","умеренный","низкая","средний"),
+    ("высокая","умеренный","высокая","средний"),
+    ("высокая","высокий","низкая","высокий"),
+    ("высокая","высокий","высокая","высокий"),
+    ("высокая","экстремальный","низкая","высокий"),
+    ("высокая","экстремальный","высокая","высокий"),
+]
+
+risk_levels = {"низкий": 20, "средний": 50, "высокий": 80}
+
+
+def evaluate(temp, uv, hum):
+    """
+    Риск и активации выходов (S, 3) для одномерных массивов входов:
+    min по условиям правила, max по правилам одного выхода, взвешенное среднее уровней.
+    """
+    temp, uv, hum = (np.asarray(v, dtype=float).reshape(-1, 1) for v in (temp, uv, hum))
+    mu = []
+    for x, terms in ((temp, TEMP_TERMS), (uv, UV_TERMS), (hum, HUM_TERMS)):
+        a, b, c = np.array(list(terms.values()), dtype=float).T
+        mu.append(dict(zip(terms, trimf(x, a, b, c).T)))
+    mt, mu_uv, mh = mu
+
+    act = np.zeros((temp.shape[0], len(risk_levels)))
+    for t, u, h, r in rules:
+        alpha = np.minimum(np.minimum(mt[t], mu_uv[u]), mh[h])
+        k = list(risk_levels).index(r)
+        act[:, k] = np.maximum(act[:, k], alpha)
+    num = act @ np.array(list(risk_levels.values()), dtype=float)
+    den = act.sum(axis=1)
+    return np.divide(num, den, out=np.zeros_like(num), where=den != 0), act
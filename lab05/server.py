@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+import model
+
+INPUTS = tuple(model.INPUTS)         # имена входов из sunburn.json
+
+
+class MicroBatcher:
+    """
+    Склеивает одиночные запросы в пачки: первая точка открывает окно window
+    секунд, всё пришедшее за это время (не больше max_batch) считается одним
+    model.evaluate_batch.
+    """
+
+    def __init__(self, window=0.002, max_batch=4096, evaluate=model.evaluate_batch):
+        self.window = window
+        self.max_batch = max_batch
+        self.evaluate = evaluate
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.points = 0
+
+    async def score(self, points):
+        """points — массив (k, len(INPUTS)); возвращает риски (k,)."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((points, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            size = len(items[0][0])
+            deadline = loop.time() + self.window
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                size += len(item[0])
+
+            pts = np.concatenate([p for p, _ in items])
+            try:
+                crisp, _ = self.evaluate(*pts.T)
+            except Exception as e:
+                # отменённый запрос (клиент ушёл) не должен ронять цикл пачек
+                for _, future in items:
+                    if not future.cancelled():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.points += len(pts)
+            start = 0
+            for p, future in items:
+                if not future.cancelled():
+                    future.set_result(crisp[start:start + len(p)])
+                start += len(p)
+
+
+class Stats:
+    """Пропускная способность и перцентили задержки по последним window запросам."""
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)
+        self.finished = deque(maxlen=window)     # моменты завершения тех же запросов
+        self.requests = 0
+        self.errors = 0
+
+    def add(self, seconds):
+        self.requests += 1
+        self.latencies.append(seconds)
+        self.finished.append(time.perf_counter())
+
+    def snapshot(self, batcher):
+        elapsed = time.perf_counter() - self.finished[0] if self.finished else 0.0
+        lat = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if len(lat) else (0.0, 0.0, 0.0)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "points": batcher.points,
+            "batches": batcher.batches,
+            "mean_batch": batcher.points / batcher.batches if batcher.batches else 0.0,
+            "requests_per_s": len(self.finished) / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99),
+                           "max": float(lat.max()) if len(lat) else 0.0},
+        }
+
+
+def parse_points(body):
+    """
+    {"temp": 28, "uv": 7, "hum": 40} (входы INPUTS) или список таких объектов → массив (k, len(INPUTS)).
+    Второй ответ — был ли запрос одиночным.
+    """
+    data = json.loads(body)
+    single = isinstance(data, dict)
+    rows = [data] if single else data
+    if not isinstance(rows, list) or not rows:
+        raise ValueError("ожидается объект или непустой список объектов")
+    for r in rows:
+        missing = [k for k in INPUTS if not isinstance(r, dict) or k not in r]
+        if missing:
+            raise ValueError(f"не хватает входов: {', '.join(missing)}")
+    pts = np.array([[float(r[k]) for k in INPUTS] for r in rows])
+    if not np.isfinite(pts).all():
+        raise ValueError("входы должны быть конечными числами")
+    return pts, single
+
+
+class ScoringServer:
+    """
+    Минимальный HTTP/1.1 сервер на asyncio (keep-alive, только Content-Length):
+      POST /score — риск для одной точки или списка точек;
+      GET  /stats — счётчики, запросов/с и перцентили задержки.
+    """
+
+    def __init__(self, window=0.002, max_batch=4096):
+        self.batcher = MicroBatcher(window, max_batch)
+        self.stats = Stats()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.dispatch(method, path, body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                    .encode("latin-1") + data)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        if method == "GET" and path == "/stats":
+            return "200 OK", self.stats.snapshot(self.batcher)
+        if method != "POST" or path != "/score":
+            return "404 Not Found", {"error": "POST /score или GET /stats"}
+
+        t0 = time.perf_counter()
+        try:
+            pts, single = parse_points(body)
+        except (ValueError, KeyError, TypeError) as e:
+            self.stats.errors += 1
+            return "400 Bad Request", {"error": str(e)}
+        try:
+            risk = await self.batcher.score(pts)
+        except Exception as e:
+            # ошибка модели — ответ 500, соединение остаётся открытым
+            self.stats.errors += 1
+            return "500 Internal Server Error", {"error": f"{type(e).__name__}: {e}"}
+        self.stats.add(time.perf_counter() - t0)
+        if single:
+            return "200 OK", {"risk": float(risk[0])}
+        return "200 OK", {"risk": risk.tolist()}
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        worker = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"слушаю http://{host}:{port} (окно {self.batcher.window * 1000:g} мс)", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный HTTP-сервис оценки риска ожога")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window", type=float, default=2.0, help="окно склейки, мс")
+    parser.add_argument("--max-batch", type=int, default=4096)
+    args = parser.parse_args()
+    try:
+        asyncio.run(ScoringServer(args.window / 1000, args.max_batch).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
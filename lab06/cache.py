@@ -0,0 +1,109 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from population import Population, target
+
+
+class FitnessCache:
+    """
+    Кеш fitness по генотипу для упакованных популяций: cache(pop) → fitness (N,).
+
+    При L ≤ dense_bits вся таблица 2^L значений считается один раз, дальше
+    только индексация. Иначе — LRU на maxsize генотипов: в каждой популяции
+    считаются лишь генотипы, которых нет в кеше, одним пакетным вызовом fitness.
+    Повтор генотипа (в том числе внутри одной популяции) — попадание.
+    """
+
+    def __init__(self, fitness=target, maxsize=1 << 16, dense_bits=16):
+        self.fitness = fitness
+        self.maxsize = maxsize
+        self.dense_bits = dense_bits
+        self.table = None            # плотная таблица для малых L
+        self.table_L = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.table = self.table_L = None
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "size": len(self.entries) if self.table is None else len(self.table),
+                "dense": self.table is not None}
+
+    def __call__(self, pop):
+        if pop.L <= self.dense_bits:
+            return self._dense(pop)
+        return self._lru(pop)
+
+    def _dense(self, pop):
+        if self.table_L != pop.L:
+            # все 2^L генотипов: слово = номер генотипа
+            everything = Population(np.arange(1 << pop.L, dtype=np.uint64)[:, None], pop.L)
+            self.table = np.asarray(self.fitness(everything.decode()), dtype=float)
+            self.table_L = pop.L
+            # этот вызов сам считает таблицу: его особи уже учтены в 2^L промахах
+            self.misses += len(self.table)
+        else:
+            self.hits += len(pop)
+        return self.table[pop.words[:, 0].astype(np.intp)]
+
+    def _lru(self, pop):
+        # уникальные генотипы партии: строки слов как байтовые ключи
+        rows = pop.words.view(np.dtype((np.void, pop.words.dtype.itemsize * pop.words.shape[1]))).ravel()
+        uniq, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        values = np.empty(len(uniq))
+        missing = []
+        for i, key in enumerate(uniq.tolist()):
+            v = self.entries.get(key)
+            if v is None:
+                missing.append(i)
+            else:
+                self.entries.move_to_end(key)
+                values[i] = v
+        if missing:
+            missing = np.array(missing)
+            values[missing] = self.fitness(pop.take(first[missing]).decode())
+            for i in missing.tolist():
+                self.entries[uniq[i].tobytes()] = values[i]
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        self.misses += len(missing)
+        self.hits += len(pop) - len(missing)
+        return values[inverse.ravel()]
+
+
+if __name__ == "__main__":
+    import time
+
+    from population import evolve
+
+    calls = [0]
+
+    def expensive(x):
+        """Имитация дорогой модели: 20 мкс на особь."""
+        calls[0] += len(x)
+        time.sleep(20e-6 * len(x))
+        return target(x)
+
+    for L in (12, 64):
+        for cached in (False, True):
+            calls[0] = 0
+            cache = FitnessCache(expensive) if cached else None
+            evaluate = cache if cached else (lambda pop: expensive(pop.decode()))
+            t0 = time.perf_counter()
+            _, hist = evolve(1000, L, pm=0.002, G=100, seed=0, evaluate=evaluate)
+            line = f"L={L}, кеш {'да ' if cached else 'нет'}: {time.perf_counter() - t0:.2f} с, вызовов f {calls[0]}"
+            if cached:
+                info = cache.info()
+                line += f", попаданий {info['hit_rate']:.0%}, {'таблица' if info['dense'] else 'LRU'} {info['size']}"
+            print(line + f", лучший f={hist[-1]:.6f}")
@@ -1,5 +1,9 @@
 import random
 import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
 import matplotlib.pyplot as plt
 
 # ----- параметры -----
@@ -19,9 +23,13 @@ def decode(ch):
 def init_pop(N):
     return [format(random.randint(0, MAX_INT), '04b') for _ in range(N)]
 
-# Оценка приспособленности
+# Оценка приспособленности (значение на генотип считается один раз)
+@lru_cache(maxsize=2**16)
+def fitness(ch):
+    return f(decode(ch))
+
 def evaluate(pop):
-    return [f(decode(ch)) for ch in pop]
+    return [fitness(ch) for ch in pop]
 
 # Селекция рулеткой
 def select_roulette(pop, fit):
@@ -53,65 +61,134 @@ def mutate(ch, pm):
             mutated.append(i+1)
     return ''.join(ch_list), mutated
 
+# ---- разнообразие популяции ----
+def diversity(pop):
+    """Среднее попарное расстояние Хэмминга, делённое на L (0 — все особи одинаковы)."""
+    n = len(pop)
+    if n < 2:
+        return 0.0
+    ones = [sum(ch[j] == '1' for ch in pop) for j in range(L)]
+    return sum(k * (n - k) for k in ones) / (n * (n - 1) / 2) / L
+
+# ---- вывод событий (прежняя печать по ходу работы) ----
+def print_event(event, g, data):
+    if event == "generation":
+        print(f"\n=== Поколение {g} ===")
+        print(f"Популяция:")
+        for i, (ch, fv) in enumerate(zip(data["pop"], data["fit"]), 1):
+            print(f"  {i}. {ch}  x={decode(ch):.3f}  f={fv:.6f}")
+        print(f"max={data['best']:.6f}, avg={data['avg']:.6f}")
+    elif event == "parents":
+        print("Родители:", data["parents"])
+        print("Кроссовер:")
+    elif event == "crossover":
+        if data["point"]:
+            print(f"  {data['p1']} × {data['p2']} -> точка {data['point']}")
+        else:
+            print(f"  {data['p1']} × {data['p2']} -> без кроссовера")
+    elif event == "mutations":
+        print("Мутации:")
+        for i, muts, old, new in data["mutated"]:
+            print(f"  особь {i+1}, биты {muts}: {old} → {new}")
+    elif event == "done":
+        print("\nИТОГ")
+        print(f"Лучшее решение: {data['chromosome']} → x={data['x']:.4f}, f={data['f']:.6f}")
+
+# ---- результат запуска ----
+@dataclass
+class GAResult:
+    best: np.ndarray          # max fitness по поколениям
+    avg: np.ndarray           # средний fitness по поколениям
+    diversity: np.ndarray     # diversity(pop) по поколениям
+    timings: dict             # секунды на фазы evaluate / select / crossover / mutate
+    population: list          # итоговая популяция
+    chromosome: str           # лучшая особь итоговой популяции
+    x: float
+    f: float
+
 # ---- основной ГА ----
-def GA(N=6, pc=0.8, pm=0.05, G=30):
+def GA(N=6, pc=0.8, pm=0.05, G=30, verbose=False, plot=False, on_event=None, seed=None):
+    """
+    Без печати и графиков по умолчанию; возвращает GAResult.
+    verbose=True — прежняя подробная печать (print_event),
+    on_event(event, g, data) — свой обработчик событий вместо печати,
+    plot=True — график max fitness, seed — зерно random.
+    """
+    if verbose and on_event is None:
+        on_event = print_event
+    if seed is not None:
+        random.seed(seed)
+    timings = {"evaluate": 0.0, "select": 0.0, "crossover": 0.0, "mutate": 0.0}
+    clock = time.perf_counter
     pop = init_pop(N)
-    best_hist = []
+    best_hist, avg_hist, div_hist = [], [], []
 
     for g in range(1, G+1):
-        print(f"\n=== Поколение {g} ===")
-
+        t0 = clock()
         fit = evaluate(pop)
+        timings["evaluate"] += clock() - t0
         best = max(fit)
         avg = sum(fit)/len(fit)
-        print(f"Популяция:")
-        for i, (ch, fv) in enumerate(zip(pop, fit), 1):
-            print(f"  {i}. {ch}  x={decode(ch):.3f}  f={fv:.6f}")
-
-        print(f"max={best:.6f}, avg={avg:.6f}")
         best_hist.append(best)
+        avg_hist.append(avg)
+        div_hist.append(diversity(pop))
+        if on_event:
+            on_event("generation", g, {"pop": pop, "fit": fit, "best": best, "avg": avg})
 
         # --- селекция ---
+        t0 = clock()
         parents = [select_roulette(pop, fit) for _ in range(N)]
-        print("Родители:", parents)
+        timings["select"] += clock() - t0
+        if on_event:
+            on_event("parents", g, {"parents": parents})
 
         # --- кроссовер ---
+        t0 = clock()
         new_pop = []
-        print("Кроссовер:")
         for i in range(0, N, 2):
             p1 = parents[i]
             p2 = parents[i+1 if i+1 < N else 0]
             c1, c2, point = crossover(p1, p2, pc)
-            if point:
-                print(f"  {p1} × {p2} -> точка {point}")
-            else:
-                print(f"  {p1} × {p2} -> без кроссовера")
+            if on_event:
+                on_event("crossover", g, {"p1": p1, "p2": p2, "point": point})
             new_pop += [c1, c2]
+        new_pop = new_pop[:N]     # при нечётном N лишний потомок не нужен
+        timings["crossover"] += clock() - t0
 
         # --- мутация ---
-        print("Мутации:")
+        t0 = clock()
+        mutated = []
         for i in range(N):
             new, muts = mutate(new_pop[i], pm)
             if muts:
-                print(f"  особь {i+1}, биты {muts}: {new_pop[i]} → {new}")
+                mutated.append((i, muts, new_pop[i], new))
             new_pop[i] = new
+        timings["mutate"] += clock() - t0
+        if on_event:
+            on_event("mutations", g, {"mutated": mutated})
 
         pop = new_pop
 
-    # график
-    plt.plot(best_hist)
+    final_fit = evaluate(pop)
+    best_f = max(final_fit)
+    ch = pop[final_fit.index(best_f)]
+    result = GAResult(np.array(best_hist), np.array(avg_hist), np.array(div_hist), timings,
+                      pop, ch, decode(ch), best_f)
+    if on_event:
+        on_event("done", G, {"chromosome": ch, "x": result.x, "f": best_f, "result": result})
+
+    if plot:
+        plot_history(result)
+    return result
+
+def plot_history(result):
+    plt.plot(result.best)
     plt.title("Изменение максимального fitness")
     plt.xlabel("Поколение")
     plt.ylabel("max fitness")
     plt.grid(True)
     plt.show()
 
-    print("\nИТОГ")
-    final_fit = evaluate(pop)
-    best_f = max(final_fit)
-    ix = final_fit.index(best_f)
-    ch = pop[ix]
-    print(f"Лучшее решение: {ch} → x={decode(ch):.4f}, f={best_f:.6f}")
-
 # ---- запуск ----
-GA(N=6, pc=0.9, pm=0.01, G=50)
+if __name__ == "__main__":
+    GA(N=6, pc=0.9, pm=0.01, G=50, verbose=True, plot=True)
@@ -0,0 +1,132 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from population import Population, breed, target
+from selection import roulette
+
+
+class PoolEvaluator:
+    """
+    Расчёт fitness в пуле процессов: evaluator(pop) → fitness (N,).
+    Популяция режется на куски не меньше min_chunk особей и не больше
+    4 кусков на процесс — пересылка массива амортизируется на весь кусок.
+    fitness должна быть функцией уровня модуля (её передают через pickle).
+    Подставляется в population.evolve(evaluate=...).
+    """
+
+    def __init__(self, fitness=target, workers=None, min_chunk=1024):
+        self.fitness = fitness
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+        self.pool = ProcessPoolExecutor(self.workers)
+
+    def __call__(self, pop):
+        x = pop.decode()
+        n_chunks = max(1, min(math.ceil(len(x) / self.min_chunk), 4 * self.workers))
+        if n_chunks == 1:
+            return np.asarray(self.fitness(x), dtype=float)
+        parts = self.pool.map(self.fitness, np.array_split(x, n_chunks))
+        return np.concatenate([np.asarray(p, dtype=float) for p in parts])
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ====== МОДЕЛЬ ОСТРОВОВ ======
+def _island_epoch(words, fit, L, generations, pc, pm, fitness, select, rng):
+    """
+    generations поколений одного острова (в отдельном процессе).
+    fit — fitness текущей популяции, если уже известен (после миграции).
+    Возвращает (слова, fitness итоговой популяции, лучшие по поколениям, rng).
+    """
+    pop = Population(words, L)
+    if fit is None:
+        fit = fitness(pop.decode())
+    best = []
+    for _ in range(generations):
+        best.append(fit.max())
+        pop = breed(pop, fit, pc, pm, rng, select)
+        fit = fitness(pop.decode())
+    return pop.words, fit, best, rng
+
+
+def migrate(words, fits, migrants):
+    """
+    Кольцевая миграция на месте: копии migrants лучших особей острова i
+    заменяют столько же худших на острове i + 1.
+    """
+    n = len(words)
+    best = [np.argsort(f)[-migrants:] for f in fits]
+    moving = [(words[i][best[i]].copy(), fits[i][best[i]].copy()) for i in range(n)]
+    for i in range(n):
+        dst = (i + 1) % n
+        worst = np.argsort(fits[dst])[:migrants]
+        words[dst][worst], fits[dst][worst] = moving[i]
+
+
+def islands(n_islands=4, N=100, L=16, pc=0.9, pm=0.01, G=50, migrate_every=5, migrants=2,
+            fitness=target, select=roulette, seed=None, workers=None):
+    """
+    Модель островов: n_islands независимых популяций по N особей эволюционируют
+    в отдельных процессах и каждые migrate_every поколений обмениваются лучшими.
+    Генераторы островов порождаются из seed, поэтому результат воспроизводим
+    при любом числе процессов.
+    Возвращает (популяции, fitness популяций, лучший fitness (G, n_islands)).
+    """
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_islands)]
+    words = [Population.random(N, L, r).words for r in rngs]
+    fits = [None] * n_islands
+    best = []
+    with ProcessPoolExecutor(workers or min(n_islands, os.cpu_count() or 1)) as pool:
+        done = 0
+        while done < G:
+            k = min(migrate_every, G - done)
+            results = list(pool.map(_island_epoch, words, fits, [L] * n_islands, [k] * n_islands,
+                                    [pc] * n_islands, [pm] * n_islands, [fitness] * n_islands,
+                                    [select] * n_islands, rngs))
+            words, fits, hist, rngs = map(list, zip(*results))
+            best.append(np.array(hist).T)
+            done += k
+            if done < G and n_islands > 1 and migrants > 0:
+                migrate(words, fits, migrants)
+    return [Population(w, L) for w in words], fits, np.concatenate(best)
+
+
+def slow_target(x):
+    """target с задержкой 50 мкс на особь — имитация внешней модели."""
+    import time
+    time.sleep(50e-6 * len(x))
+    return target(x)
+
+
+if __name__ == "__main__":
+    import time
+
+    from population import evolve
+
+    rng = np.random.default_rng(0)
+    pop = Population.random(100_000, 64, rng)
+    with PoolEvaluator(target, min_chunk=4096) as ev:
+        assert np.array_equal(ev(pop), target(pop.decode()))
+        print(f"процессов {ev.workers}: пул совпадает с расчётом в одном процессе")
+
+    for workers in (1, 4):
+        with PoolEvaluator(slow_target, workers, min_chunk=256) as ev:
+            t0 = time.perf_counter()
+            _, hist = evolve(4000, 32, G=5, seed=0, evaluate=ev)
+            print(f"evolve, {workers} процесс(ов), медленный fitness: {time.perf_counter() - t0:.2f} с")
+
+    for workers in (1, 4):
+        t0 = time.perf_counter()
+        pops, fits, best = islands(4, 200, 32, G=60, fitness=slow_target, seed=0, workers=workers)
+        print(f"острова 4×200, медленный fitness, {workers} процесс(ов): {time.perf_counter() - t0:.2f} с, "
+              f"лучший по островам {np.round(best[-1], 6)}")
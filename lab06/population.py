@@ -0,0 +1,242 @@
+import numpy as np
+
+from selection import roulette
+
+WORD = 64
+
+
+def target(x):
+    """Целевая функция f(x) = e^(-x) · sin(5πx) для массива x (как f в main.py)."""
+    return np.exp(-x) * np.sin(5 * np.pi * x)
+
+
+def _low_masks(bits, n_words):
+    """
+    Маски младших bits бит для каждой строки: (len(bits), n_words) uint64.
+    bits может быть от 0 до 64 · n_words.
+    """
+    bits = np.asarray(bits, dtype=np.int64)[:, None] - WORD * np.arange(n_words)
+    full = bits >= WORD
+    part = np.clip(bits, 0, WORD - 1).astype(np.uint64)
+    masks = (np.uint64(1) << part) - np.uint64(1)
+    return np.where(full, ~np.uint64(0), masks)
+
+
+class Population:
+    """
+    Популяция из N хромосом длины L, упакованных по 64 бита в слово.
+
+    Хромосома — число G из L бит, как у строки '0101' в main.py: первый символ
+    строки — старший бит. Слова младшими вперёд: words[i, k] = (G_i >> 64k) & (2^64 - 1),
+    лишние старшие биты последнего слова всегда нулевые.
+    """
+
+    def __init__(self, words, L):
+        self.words = np.ascontiguousarray(words, dtype=np.uint64)
+        self.L = L
+
+    @staticmethod
+    def n_words(L):
+        return (L + WORD - 1) // WORD
+
+    @classmethod
+    def random(cls, N, L, rng):
+        """Случайная начальная популяция (как init_pop)."""
+        words = rng.integers(0, 1 << WORD, size=(N, cls.n_words(L)), dtype=np.uint64)
+        return cls(words & _low_masks([L], cls.n_words(L)), L)
+
+    @classmethod
+    def from_strings(cls, strings):
+        L = len(strings[0])
+        bits = np.array([list(s) for s in strings]) == "1"
+        return cls._from_bits(bits[:, ::-1], L)
+
+    @classmethod
+    def _from_bits(cls, bits, L):
+        """bits (N, L): bits[:, j] — j-й младший бит."""
+        n, w = len(bits), cls.n_words(L)
+        padded = np.zeros((n, w * WORD), dtype=np.uint8)
+        padded[:, :L] = bits
+        packed = np.packbits(padded.reshape(n, w, WORD), axis=2, bitorder="little")
+        return cls(packed.view("<u8").reshape(n, w).astype(np.uint64), L)
+
+    def bits(self):
+        """(N, L) uint8: [:, j] — j-й младший бит."""
+        raw = self.words.astype("<u8").view(np.uint8).reshape(len(self), -1)
+        return np.unpackbits(raw, axis=1, bitorder="little")[:, :self.L]
+
+    def to_strings(self):
+        return ["".join(map(str, row[::-1])) for row in self.bits()]
+
+    def __len__(self):
+        return len(self.words)
+
+    def copy(self):
+        return Population(self.words.copy(), self.L)
+
+    def take(self, idx):
+        return Population(self.words[idx], self.L)
+
+    def decode(self):
+        """x = G / (2^L - 1) в [0, 1] (как decode); при L > 53 — с точностью float."""
+        # числитель и знаменатель делятся на 2^top заранее: 2.0 ** L переполняется при L ≥ 1024
+        top = WORD * (self.words.shape[1] - 1)
+        scale = 2.0 ** (WORD * np.arange(self.words.shape[1]) - top)
+        return (self.words.astype(float) @ scale) / (2.0 ** (self.L - top) - 2.0 ** -top)
+
+    # ---------- операторы ----------
+    def crossover(self, pc, rng):
+        """
+        Одноточечный кроссовер пар (0, 1), (2, 3), ...; при нечётном N последняя
+        особь скрещивается с первой. Пара скрещивается с вероятностью pc,
+        точка — от 1 до L - 1 (столько старших бит берётся от первого родителя).
+        Возвращает (потомки, точки), точка 0 — пара без кроссовера.
+        """
+        n = len(self)
+        first = np.arange(0, n, 2)
+        second = (first + 1) % n
+        a, b = self.words[first], self.words[second]
+
+        points = np.where(rng.random(len(first)) < pc,
+                          rng.integers(1, max(self.L, 2), len(first)), 0)
+        # хвост из L - point младших бит меняется местами; без кроссовера маска нулевая
+        low = _low_masks(np.where(points > 0, self.L - points, 0), a.shape[1])
+        c1 = (a & ~low) | (b & low)
+        c2 = (b & ~low) | (a & low)
+        children = np.empty((2 * len(first), a.shape[1]), dtype=np.uint64)
+        children[0::2], children[1::2] = c1, c2
+        return Population(children[:n], self.L), points
+
+    def mutate(self, pm, rng):
+        """
+        Каждый бит инвертируется с вероятностью pm (на месте).
+        Позиции мутаций разыгрываются геометрическими промежутками, поэтому
+        работа пропорциональна числу мутаций, а не N · L.
+        Возвращает номера изменённых бит в сплошной нумерации i · L + j.
+        """
+        total = len(self) * self.L
+        if pm <= 0 or total == 0:
+            return np.empty(0, dtype=np.int64)
+        if pm >= 1:
+            flips = np.arange(total)
+        else:
+            chunks, pos = [], -1
+            while True:
+                size = int(total * pm * 1.1) + 16
+                steps = np.cumsum(rng.geometric(pm, size)) + pos
+                chunks.append(steps[steps < total])
+                if steps[-1] >= total:
+                    break
+                pos = steps[-1]
+            flips = np.concatenate(chunks)
+        ind, bit = np.divmod(flips, self.L)
+        flat = self.words.reshape(-1)
+        # в одно слово может попасть несколько мутаций — нужен небуферизованный XOR
+        np.bitwise_xor.at(flat, ind * self.words.shape[1] + bit // WORD,
+                          np.uint64(1) << (bit % WORD).astype(np.uint64))
+        return flips
+
+
+def select_roulette(fit, n, rng):
+    """
+    Рулетка как select_roulette в main.py, но для всех n родителей сразу:
+    накопленные суммы один раз, затем бинарный поиск. При нулевой сумме — равновероятно.
+    Повторяет и поведение main.py при отрицательном fitness, поэтому нужна только для
+    сверки; в evolve / breed по умолчанию selection.roulette.
+    """
+    fit = np.asarray(fit, dtype=float)
+    total = fit.sum()
+    if total == 0:
+        return rng.integers(0, len(fit), n)
+    # r между 0 и суммой (при отрицательной сумме — ниже нуля), как random.uniform(0, total)
+    r = rng.random(n) * total
+    # main.py берёт первую особь, у которой накопленная сумма ≥ r. При fitness разных
+    # знаков cumsum не монотонна, а первый такой префикс — это первый, где
+    # достигнут максимум накопленных сумм; по нему бинарный поиск корректен.
+    cum = np.maximum.accumulate(np.cumsum(fit))
+    return np.minimum(np.searchsorted(cum, r, side="left"), len(fit) - 1)
+
+
+def breed(pop, fit, pc, pm, rng, select=roulette):
+    """Одно поколение операторов: селекция → кроссовер → мутация. Возвращает потомков."""
+    parents = pop.take(select(fit, len(pop), rng))
+    children, _ = parents.crossover(pc, rng)
+    children.mutate(pm, rng)
+    return children
+
+
+def evolve(N=6, L=4, pc=0.9, pm=0.01, G=50, fitness=target, seed=None, select=roulette,
+           evaluate=None):
+    """
+    Тот же цикл, что GA() в main.py (рулетка → кроссовер → мутация), но целиком
+    на массивах и без печати. fitness принимает массив x и возвращает массив,
+    select(fit, n, rng) — индексы родителей (см. selection.SELECTORS); по умолчанию
+    рулетка со сдвигом fitness, корректная и для отрицательных значений.
+    evaluate(pop) заменяет fitness(pop.decode()) целиком — например, cache.FitnessCache.
+    Возвращает (популяция, история лучшего fitness по поколениям).
+    """
+    rng = np.random.default_rng(seed)
+    if evaluate is None:
+        evaluate = lambda pop: fitness(pop.decode())
+    pop = Population.random(N, L, rng)
+    best_hist = np.empty(G)
+    for g in range(G):
+        fit = evaluate(pop)
+        best_hist[g] = fit.max()
+        pop = breed(pop, fit, pc, pm, rng, select)
+    return pop, best_hist
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    import main
+
+    # сверка упаковки и операторов с построчной версией
+    rng = np.random.default_rng(0)
+    for L in (4, 64, 65, 200, 1100):
+        p = Population.random(7, L, rng)
+        s = p.to_strings()
+        assert Population.from_strings(s).to_strings() == s
+        assert np.allclose(p.decode(), [int(c, 2) / (2 ** L - 1) for c in s])
+        kids, points = p.crossover(1.0, rng)
+        ks = kids.to_strings()
+        for i, pt in enumerate(points):
+            a, b = s[2 * i], s[(2 * i + 1) % 7]
+            want = [a[:pt] + b[pt:], b[:pt] + a[pt:]]
+            assert ks[2 * i] == want[0] and (2 * i + 1 >= 7 or ks[2 * i + 1] == want[1])
+        before = kids.bits().copy()
+        flips = kids.mutate(0.1, rng)
+        diff = np.flatnonzero((kids.bits() != before).reshape(-1))
+        assert np.array_equal(diff, np.sort(flips))
+    flips = Population.random(1000, 300, rng).mutate(0.01, rng)
+    # рулетка при fitness разных знаков: частоты как у main.select_roulette
+    for fit in ([0.5, -0.3, 0.4], [-0.2, -0.1, 0.05]):
+        random.seed(0)
+        ref = np.bincount([main.select_roulette([0, 1, 2], fit) for _ in range(100_000)], minlength=3)
+        got = np.bincount(select_roulette(fit, 100_000, rng), minlength=3)
+        assert np.allclose(ref / 1e5, got / 1e5, atol=0.01), (ref, got)
+    print(f"упаковка и операторы совпадают со строками; мутаций {len(flips)} при ожидании 3000")
+
+    # скорость поколения: строки из main.py против упакованной популяции
+    N, L = 2000, 4
+    pop = main.init_pop(N)
+    t0 = time.perf_counter()
+    fit = main.evaluate(pop)
+    parents = [main.select_roulette(pop, fit) for _ in range(N)]
+    kids = []
+    for i in range(0, N, 2):
+        kids += main.crossover(parents[i], parents[i + 1], 0.9)[:2]
+    kids = [main.mutate(ch, 0.01)[0] for ch in kids]
+    t_str = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    evolve(N, L, G=1, seed=0)
+    t_arr = time.perf_counter() - t0
+    print(f"N={N}, L={L}: поколение на строках {t_str:.3f} с, на массивах {t_arr:.4f} с")
+
+    for N, L in [(100_000, 16), (100_000, 256)]:
+        t0 = time.perf_counter()
+        _, hist = evolve(N, L, G=10, seed=0)
+        print(f"N={N}, L={L}: {(time.perf_counter() - t0) / 10:.3f} с на поколение, "
+              f"лучший f={hist[-1]:.6f}")
@@ -0,0 +1,123 @@
+import numpy as np
+
+EPS = 1e-12
+
+
+# ====== МАСШТАБИРОВАНИЕ FITNESS ======
+def scale(fit, method="shift", c=2.0):
+    """
+    Неотрицательные веса для рулетки из fitness любого знака.
+      "shift"  — f - f_min + ε (как в отчёте, п. 2.1);
+      "linear" — линейное масштабирование Гольдберга: среднее сохраняется,
+                 лучший получает вес c · среднее (после сдвига к неотрицательным);
+      "sigma"  — сигма-отсечение: max(f - (mean - c·σ), 0);
+      None     — как есть (fitness должен быть неотрицательным).
+    """
+    fit = np.asarray(fit, dtype=float)
+    if method is None:
+        if (fit < 0).any():
+            raise ValueError("отрицательный fitness без масштабирования")
+        return fit
+    if method == "shift":
+        return fit - fit.min() + EPS
+    if method == "linear":
+        w = fit - fit.min()
+        avg, top = w.mean(), w.max()
+        if top - avg <= EPS:
+            return np.ones_like(w)
+        # a·avg + b = avg, a·top + b = c·avg; при отрицательном минимуме прижимаем к нулю
+        a = (c - 1) * avg / (top - avg)
+        b = avg * (1 - a)
+        return np.maximum(a * w + b, 0)
+    if method == "sigma":
+        return np.maximum(fit - (fit.mean() - c * fit.std()), 0)
+    raise ValueError(f"неизвестное масштабирование: {method}")
+
+
+def _wheel(weights, positions):
+    """Номера особей, на которые попали точки positions ∈ [0, сумма весов)."""
+    cum = np.cumsum(weights)
+    # side="right": особь с нулевым весом не выбирается никогда
+    return np.minimum(np.searchsorted(cum, positions, side="right"), len(weights) - 1)
+
+
+# ====== СЕЛЕКЦИЯ ======
+# Все функции: (fit, n, rng, ...) → индексы n родителей.
+def roulette(fit, n, rng, scaling="shift"):
+    """Рулетка: накопленные веса один раз, все n родителей — одним бинарным поиском."""
+    w = scale(fit, scaling)
+    total = w.sum()
+    if total <= 0:
+        return rng.integers(0, len(w), n)
+    return _wheel(w, rng.random(n) * total)
+
+
+def sus(fit, n, rng, scaling="shift"):
+    """
+    Стохастическая универсальная выборка: n равноотстоящих указателей со случайным
+    сдвигом — то же матожидание, что у рулетки, но минимальный разброс.
+    Порядок перемешивается, чтобы пары для кроссовера были случайными.
+    """
+    w = scale(fit, scaling)
+    total = w.sum()
+    if total <= 0:
+        return rng.integers(0, len(w), n)
+    step = total / n
+    idx = _wheel(w, rng.random() * step + step * np.arange(n))
+    return rng.permutation(idx)
+
+
+def tournament(fit, n, rng, k=2):
+    """Турнир из k случайных участников (с возвращением); масштаб fitness не важен."""
+    fit = np.asarray(fit, dtype=float)
+    entrants = rng.integers(0, len(fit), (n, k))
+    return entrants[np.arange(n), np.argmax(fit[entrants], axis=1)]
+
+
+def rank(fit, n, rng, pressure=1.5):
+    """
+    Линейное ранжирование: вероятность зависит только от места в списке.
+    pressure ∈ [1, 2] — во сколько раз лучший выбирается чаще среднего.
+    """
+    fit = np.asarray(fit, dtype=float)
+    m = len(fit)
+    if m == 1:
+        return np.zeros(n, dtype=np.intp)
+    places = np.empty(m)
+    places[np.argsort(fit, kind="stable")] = np.arange(m)      # 0 — худший
+    w = (2 - pressure) / m + 2 * places * (pressure - 1) / (m * (m - 1))
+    return _wheel(w, rng.random(n) * w.sum())
+
+
+SELECTORS = {
+    "roulette": roulette,
+    "sus": sus,
+    "tournament": tournament,
+    "rank": rank,
+}
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    import main
+    from population import target
+
+    print(f"{'N':>6} {'метод':>10} {'сек':>9} {'ср. f родителей':>16}")
+    for N in [100, 1000, 5000, 100_000]:
+        rng = np.random.default_rng(0)
+        x = rng.random(N)
+        fit = target(x)
+        if N <= 5000:
+            # исходная рулетка: сумма и линейный проход на каждого родителя, O(N²)
+            pop, fl = list(range(N)), fit.tolist()
+            random.seed(0)
+            t0 = time.perf_counter()
+            idx = [main.select_roulette(pop, fl) for _ in range(N)]
+            print(f"{N:>6} {'main.py':>10} {time.perf_counter() - t0:>9.4f} {fit[idx].mean():>16.4f}")
+        for name, select in SELECTORS.items():
+            t0 = time.perf_counter()
+            idx = select(fit, N, rng)
+            print(f"{N:>6} {name:>10} {time.perf_counter() - t0:>9.4f} {fit[idx].mean():>16.4f}")
+        print(f"{N:>6} {'(среднее)':>10} {'':>9} {fit.mean():>16.4f}")
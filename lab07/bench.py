@@ -0,0 +1,129 @@
+import argparse
+import time
+import tracemalloc
+from collections import deque
+from itertools import combinations
+
+import main
+
+
+# -------------------------------------------------------------
+# Обобщённая задача на кортежах: фермер + n предметов,
+# conflicts — пары, которые нельзя оставлять без фермера,
+# capacity — сколько предметов помещается в лодку вместе с фермером.
+# При n = 3, conflicts = ((0, 1), (1, 2)) это исходная задача из main.py.
+# -------------------------------------------------------------
+def make_puzzle(n, conflicts=(), capacity=1):
+    def is_valid(state):
+        F = state[0]
+        return not any(state[a + 1] == state[b + 1] != F for a, b in conflicts)
+
+    def neighbors(state):
+        F = state[0]
+        new_F = 'R' if F == 'L' else 'L'
+        here = [i for i in range(1, n + 1) if state[i] == F]
+        result = []
+        for k in range(capacity + 1):
+            for group in combinations(here, k):
+                nxt = list(state)
+                nxt[0] = new_F
+                for i in group:
+                    nxt[i] = new_F
+                nxt = tuple(nxt)
+                if is_valid(nxt):
+                    result.append(nxt)
+        return result
+
+    return neighbors, ('L',) * (n + 1), ('R',) * (n + 1)
+
+
+def make_heuristic(capacity=1):
+    """Допустимая эвристика для make_puzzle: за рейс на другой берег уходит не больше capacity предметов."""
+    def h(state, goal):
+        away = sum(s != g for s, g in zip(state[1:], goal[1:]))
+        return -(-away // capacity)
+    return h
+
+
+# -------------------------------------------------------------
+# Прежние версии: полный путь копируется в каждый элемент очереди
+# -------------------------------------------------------------
+def bfs_copy(start, goal, neighbors):
+    queue = deque([(start, [start])])
+    visited = {start}
+    while queue:
+        state, path = queue.popleft()
+        if state == goal:
+            return path
+        for nxt in neighbors(state):
+            if nxt not in visited:
+                visited.add(nxt)
+                queue.append((nxt, path + [nxt]))
+    return None
+
+
+def astar_copy(start, goal, neighbors, h=main.heuristic):
+    open_list = [(start, [start], 0)]
+    visited = set()
+    while open_list:
+        open_list.sort(key=lambda x: x[2] + h(x[0], goal))
+        state, path, g = open_list.pop(0)
+        if state == goal:
+            return path
+        visited.add(state)
+        for nxt in neighbors(state):
+            if nxt not in visited:
+                open_list.append((nxt, path + [nxt], g + 1))
+    return None
+
+
+def measure(solve, *args):
+    """
+    (длина пути, секунды, пик памяти в КБ, раскрыто вершин или None);
+    время — отдельным прогоном без tracemalloc.
+    """
+    t0 = time.perf_counter()
+    result = solve(*args)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    solve(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    path, expanded = result[:2] if isinstance(result, tuple) else (result, None)
+    return len(path) - 1, elapsed, peak / 1024, expanded
+
+
+SOLVERS = [
+    ("bfs", main.bfs, bfs_copy),
+    ("astar", main.astar, astar_copy),
+]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Память и время: ссылки на родителя против копий пути")
+    parser.add_argument("--items", type=int, nargs="+", default=[3, 6, 9, 12, 14])
+    parser.add_argument("--capacity", type=int, default=1)
+    parser.add_argument("--astar-max", type=int, default=6, help="прежний A* с сортировкой списка дальше идёт минутами")
+    args = parser.parse_args()
+
+    # сверка с исходной задачей
+    nb, s, g = make_puzzle(3, ((0, 1), (1, 2)))
+    assert all(set(nb(x)) == set(main.get_neighbors(x))
+               for x in main.bfs(s, g)[0])
+
+    print(f"{'n':>3} {'алгоритм':>8} {'шагов':>6} {'раскрыто':>9} {'мкс/раскр.':>11} {'сек':>9} "
+          f"{'сек (копии)':>12} {'КБ':>8} {'КБ (копии)':>11}")
+    for n in args.items:
+        neighbors, start, goal = make_puzzle(n, capacity=args.capacity)
+        h = make_heuristic(args.capacity)
+        for name, new, old in SOLVERS:
+            extra = (h,) if name == "astar" else ()
+            steps, t_new, m_new, expanded = measure(new, start, goal, neighbors, *extra)
+            row = (f"{n:>3} {name:>8} {steps:>6} {expanded:>9} {t_new / max(expanded, 1) * 1e6:>11.2f} "
+                   f"{t_new:>9.4f}")
+            if name == "astar" and n > args.astar_max:
+                print(f"{row} {'—':>12} {m_new:>8.0f} {'—':>11}", flush=True)
+                continue
+            steps_old, t_old, m_old, _ = measure(old, start, goal, neighbors, *extra)
+            assert steps_old == steps
+            print(f"{row} {t_old:>12.4f} {m_new:>8.0f} {m_old:>11.0f}", flush=True)
@@ -0,0 +1,254 @@
+import os
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+def _gather(indptr, indices, rows):
+    """Все соседи вершин rows одним массивом + номер строки для каждого (CSR-выборка)."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return indices[starts[owner] + offsets], owner
+
+
+class StateGraph:
+    """
+    Достижимый граф состояний, перечисленный один раз, в формате CSR:
+    соседи вершины v — indices[indptr[v]:indptr[v + 1]], states[v] — само состояние.
+    Состояния — целые числа (puzzle.RiverPuzzle) или кортежи (main.py).
+
+    Поверх графа считается таблица расстояний до цели dist (обратный BFS по
+    транспонированному графу). Дальше любой запрос «путь от s» — проход по таблице
+    за O(длина пути), а dist — точная (идеальная) эвристика для A*.
+    """
+
+    def __init__(self, states, indptr, indices):
+        self.states = states
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.numeric = isinstance(states, np.ndarray) and states.ndim == 1 and states.dtype.kind == "i"
+        self.index = None if self.numeric else {s: i for i, s in enumerate(states)}
+        self.goal = None
+        self.dist = None
+        self.key = None
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    # ---------- построение ----------
+    @classmethod
+    def build(cls, start, neighbors):
+        """Обход из start с любой функцией соседей (например, main.get_neighbors)."""
+        index = {start: 0}
+        states = [start]
+        indptr, indices = [0], []
+        for s in states:                      # states растёт по ходу обхода
+            for nxt in set(neighbors(s)):
+                if nxt not in index:
+                    index[nxt] = len(states)
+                    states.append(nxt)
+                indices.append(index[nxt])
+            indptr.append(len(indices))
+        if all(isinstance(s, int) for s in states):
+            order = np.argsort(states)
+            return cls._renumber(np.array(states, dtype=np.int64), order, indptr, indices)
+        return cls(states, indptr, indices)
+
+    @classmethod
+    def _renumber(cls, states, order, indptr, indices):
+        """Целые состояния — в порядке возрастания, чтобы искать номер бинарным поиском."""
+        indptr, indices = np.asarray(indptr), np.asarray(indices)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        counts = np.diff(indptr)[order]
+        rows, _ = _gather(indptr, indices, order)
+        new_indptr = np.concatenate([[0], np.cumsum(counts)])
+        return cls(states[order], new_indptr, rank[rows])
+
+    @classmethod
+    def from_puzzle(cls, puzzle, block=1 << 22):
+        """Весь достижимый граф RiverPuzzle поуровнево на numpy, без Python-цикла по вершинам."""
+        seen = np.zeros(puzzle.size, dtype=bool)
+        seen[puzzle.start] = True
+        frontier = np.array([puzzle.start], dtype=np.int64)
+        src_all, dst_all = [], []
+        step = max(1, block // max(len(puzzle.loads), 1))
+        while frontier.size:
+            found = []
+            for lo in range(0, frontier.size, step):
+                src, nxt = puzzle.expand(frontier[lo:lo + step])
+                src_all.append(src)
+                dst_all.append(nxt)
+                new = np.unique(nxt[~seen[nxt]])
+                seen[new] = True
+                found.append(new)
+            frontier = np.concatenate(found)
+
+        states = np.flatnonzero(seen)
+        src = np.searchsorted(states, np.concatenate(src_all))
+        dst = np.searchsorted(states, np.concatenate(dst_all))
+        order = np.lexsort((dst, src))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=len(states)))])
+        return cls(states, indptr, dst[order])
+
+    # ---------- кеш на диске ----------
+    def save(self, path, key=None):
+        # цель хранится самим состоянием: недостижимой цели нет среди вершин
+        extra = {} if self.dist is None else {"dist": self.dist, "goal": np.asarray(self.goal)}
+        if key is not None:
+            extra["key"] = key
+        np.savez(path, states=np.asarray(self.states), indptr=self.indptr, indices=self.indices, **extra)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        states = data["states"]
+        if states.ndim == 2:                  # кортежи из main.py
+            states = [tuple(row.tolist()) for row in states]
+        graph = cls(states, data["indptr"], data["indices"])
+        graph.key = str(data["key"]) if "key" in data else None
+        if "dist" in data:
+            goal = data["goal"].tolist()
+            graph.goal = tuple(goal) if isinstance(goal, list) else goal
+            graph.dist = data["dist"]
+        return graph
+
+    @classmethod
+    def cached(cls, name, build, goal=None, key=None, cache_dir=CACHE_DIR):
+        """
+        Граф из cache_dir/name.npz; если файла нет — build(), таблица до goal и сохранение.
+        key — отпечаток задачи (например, RiverPuzzle.fingerprint()): хранится в файле,
+        и при несовпадении граф строится заново, даже если имя то же.
+        """
+        path = os.path.join(cache_dir, name + ".npz")
+        if os.path.exists(path):
+            graph = cls.load(path)
+            if (goal is None or graph.goal == goal) and (key is None or graph.key == key):
+                return graph
+        graph = build()
+        if goal is not None:
+            graph.distances_to(goal)
+        os.makedirs(cache_dir, exist_ok=True)
+        graph.save(path, key)
+        graph.key = key
+        return graph
+
+    # ---------- запросы ----------
+    def id(self, state):
+        if self.numeric:
+            i = int(np.searchsorted(self.states, state))
+            if i == len(self.states) or self.states[i] != state:
+                raise KeyError(state)
+            return i
+        return self.index[state]
+
+    def neighbors(self, state):
+        """Соседи по графу — замена get_neighbors для bfs / astar из main.py."""
+        v = self.id(state)
+        out = self.indices[self.indptr[v]:self.indptr[v + 1]]
+        if self.numeric:
+            return self.states[out].tolist()
+        return [self.states[i] for i in out.tolist()]
+
+    def distances_to(self, goal):
+        """Точные расстояния до goal от всех вершин (-1 — цель недостижима)."""
+        # транспонированный граф: ребро u → v становится v → u
+        src = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        rev_indptr = np.concatenate([[0], np.cumsum(np.bincount(self.indices, minlength=len(self)))])
+        rev_indices = src[order]
+
+        dist = np.full(len(self), -1, dtype=np.int32)
+        try:
+            frontier = np.array([self.id(goal)])
+        except KeyError:
+            # цель недостижима из старта: её нет среди вершин, до неё не дойти ниоткуда
+            self.goal, self.dist = goal, dist
+            return dist
+        dist[frontier] = 0
+        d = 0
+        while frontier.size:
+            d += 1
+            prev, _ = _gather(rev_indptr, rev_indices, frontier)
+            prev = np.unique(prev[dist[prev] < 0])
+            dist[prev] = d
+            frontier = prev
+        self.goal, self.dist = goal, dist
+        return dist
+
+    def _check_dist(self):
+        if self.dist is None:
+            raise ValueError("таблица расстояний не посчитана: сначала distances_to(goal)")
+
+    def path(self, start):
+        """Кратчайший путь start → goal проходом по таблице: O(длина пути · степень)."""
+        self._check_dist()
+        v = self.id(start)
+        if self.dist[v] < 0:
+            return None
+        path = [v]
+        while self.dist[v] > 0:
+            out = self.indices[self.indptr[v]:self.indptr[v + 1]]
+            v = int(out[np.argmax(self.dist[out] == self.dist[v] - 1)])
+            path.append(v)
+        if self.numeric:
+            return self.states[path].tolist()
+        return [self.states[i] for i in path]
+
+    def heuristic(self, state, goal):
+        """Идеальная эвристика для main.astar: точное расстояние из таблицы."""
+        self._check_dist()
+        if goal != self.goal:
+            raise ValueError("таблица расстояний посчитана для другой цели")
+        d = self.dist[self.id(state)]
+        return int(d) if d >= 0 else float("inf")
+
+
+if __name__ == "__main__":
+    import time
+
+    import main
+    import puzzle
+
+    # исходная задача из main.py: граф на кортежах
+    g = StateGraph.cached("fwgc", lambda: StateGraph.build(main.start_state, main.get_neighbors),
+                          goal=main.goal_state)
+    print(f"волк/коза/капуста: {len(g)} состояний, {g.n_edges} рёбер, "
+          f"путь {len(g.path(main.start_state)) - 1} шагов")
+    path, expanded, _ = main.astar(main.start_state, main.goal_state, g.neighbors, g.heuristic)
+    print(f"A* с идеальной эвристикой: {len(path) - 1} шагов, раскрыто {expanded}")
+
+    for name, make in [("items16", lambda: puzzle.n_items(16, [(0, 1), (1, 2)], 2)),
+                       ("mc8", lambda: puzzle.missionaries_cannibals(8, 8, 4))]:
+        p = make()
+        t0 = time.perf_counter()
+        graph = StateGraph.cached(name, lambda: StateGraph.from_puzzle(p), goal=p.goal, key=p.fingerprint())
+        t_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        graph = StateGraph.cached(name, lambda: StateGraph.from_puzzle(p), goal=p.goal, key=p.fingerprint())
+        t_load = time.perf_counter() - t0
+
+        rng = np.random.default_rng(0)
+        starts = graph.states[rng.integers(0, len(graph), 1000)].tolist()
+        t0 = time.perf_counter()
+        lengths = [len(graph.path(s)) - 1 for s in starts if graph.dist[graph.id(s)] >= 0]
+        t_walk = (time.perf_counter() - t0) / len(starts)
+
+        t0 = time.perf_counter()
+        ref, bfs_expanded, _ = main.bfs(p.start, p.goal, p.neighbors)
+        t_bfs = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        path, expanded, _ = main.astar(p.start, p.goal, graph.neighbors, graph.heuristic)
+        t_astar = time.perf_counter() - t0
+        assert len(path) == len(ref) == len(graph.path(p.start))
+        print(f"{name}: {len(graph)} состояний, {graph.n_edges} рёбер; первый расчёт {t_build:.2f} с, "
+              f"из кеша {t_load:.3f} с; запрос по таблице {t_walk * 1e6:.0f} мкс "
+              f"(средний путь {np.mean(lengths):.1f}); BFS {t_bfs:.2f} с / {bfs_expanded} раскрытий, "
+              f"A* с таблицей {t_astar:.4f} с / {expanded} раскрытий")
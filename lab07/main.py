@@ -1,3 +1,4 @@
+import heapq
 from collections import deque
 
 # -------------------------------------------------------------
@@ -41,21 +42,40 @@ def get_neighbors(state):
             result.append(nxt)
     return result
 
+# -------------------------------------------------------------
+# Восстановление пути по ссылкам на родителя
+# Путь не хранится в очереди: для каждого состояния помним только,
+# откуда в него пришли, а путь собираем один раз — для найденной цели.
+# -------------------------------------------------------------
+def reconstruct_path(parents, end_state):
+    path = []
+    s = end_state
+    while s is not None:
+        path.append(s)
+        s = parents.get(s)
+    path.reverse()
+    return path
+
 # -------------------------------------------------------------
 # BFS — поиск в ширину
+# Все решатели возвращают (путь или None, раскрыто вершин, макс. размер очереди)
 # -------------------------------------------------------------
-def bfs(start, goal):
-    queue = deque([(start, [start])])
-    visited = {start}
+def bfs(start, goal, neighbors=get_neighbors):
+    queue = deque([start])
+    parents = {start: None}
+    expanded = 0
+    peak_frontier = 1
     while queue:
-        state, path = queue.popleft()
+        state = queue.popleft()
         if state == goal:
-            return path
-        for nxt in get_neighbors(state):
-            if nxt not in visited:
-                visited.add(nxt)
-                queue.append((nxt, path + [nxt]))
-    return None
+            return reconstruct_path(parents, state), expanded, peak_frontier
+        expanded += 1
+        for nxt in neighbors(state):
+            if nxt not in parents:
+                parents[nxt] = state
+                queue.append(nxt)
+        peak_frontier = max(peak_frontier, len(queue))
+    return None, expanded, peak_frontier
 
 # -------------------------------------------------------------
 # A* — простая реализация
@@ -64,35 +84,63 @@ def bfs(start, goal):
 def heuristic(state, goal):
     return sum(s != g for s, g in zip(state, goal))
 
-def astar(start, goal):
-    open_list = [(start, [start], 0)]  # состояние, путь, g
-    visited = set()
-    while open_list:
-        open_list.sort(key=lambda x: x[2] + heuristic(x[0], goal))
-        state, path, g = open_list.pop(0)
+def astar(start, goal, neighbors=get_neighbors, h=heuristic):
+    """
+    A* на двоичной куче. g_best — лучшая известная стоимость пути до состояния;
+    устаревшие записи кучи (хуже g_best или уже раскрытые) пропускаются при извлечении.
+    При равных f первым берётся состояние с меньшим h (ближе к цели), затем —
+    добавленное раньше, поэтому порядок раскрытия детерминирован.
+    """
+    counter = 0
+    h0 = h(start, goal)
+    heap = [(h0, h0, counter, start)]
+    g_best = {start: 0}
+    parents = {start: None}
+    closed = set()
+    expanded = 0
+    peak_frontier = 1
+    while heap:
+        _, _, _, state = heapq.heappop(heap)
+        if state in closed:
+            continue  # устаревшая запись
         if state == goal:
-            return path
-        visited.add(state)
-        for nxt in get_neighbors(state):
-            if nxt not in visited:
-                open_list.append((nxt, path + [nxt], g + 1))
-    return None
+            return reconstruct_path(parents, state), expanded, peak_frontier
+        closed.add(state)
+        expanded += 1
+        g = g_best[state] + 1
+        for nxt in neighbors(state):
+            if nxt in closed or g >= g_best.get(nxt, g + 1):
+                continue
+            g_best[nxt] = g
+            parents[nxt] = state
+            counter += 1
+            hn = h(nxt, goal)
+            heapq.heappush(heap, (g + hn, hn, counter, nxt))
+        peak_frontier = max(peak_frontier, len(heap))
+    return None, expanded, peak_frontier
 
 # -------------------------------------------------------------
 # Обратный BFS (поиск от цели к старту)
+# Переходы обратимы, поэтому предшественники — те же соседи.
+# Ссылки ведут к цели, поэтому собранный путь разворачиваем.
 # -------------------------------------------------------------
-def reverse_bfs(goal, start):
-    queue = deque([(goal, [goal])])
-    visited = {goal}
+def reverse_bfs(goal, start, neighbors=get_neighbors):
+    queue = deque([goal])
+    parents = {goal: None}
+    expanded = 0
+    peak_frontier = 1
     while queue:
-        state, path = queue.popleft()
+        state = queue.popleft()
         if state == start:
-            return path[::-1]  # возвращаем в правильном порядке
-        for nxt in get_neighbors(state):
-            if nxt not in visited:
-                visited.add(nxt)
-                queue.append((nxt, path + [nxt]))
-    return None
+            path = reconstruct_path(parents, state)
+            return path[::-1], expanded, peak_frontier
+        expanded += 1
+        for nxt in neighbors(state):
+            if nxt not in parents:
+                parents[nxt] = state
+                queue.append(nxt)
+        peak_frontier = max(peak_frontier, len(queue))
+    return None, expanded, peak_frontier
 
 
 def print_path(path):
@@ -105,14 +153,11 @@ def print_path(path):
 start_state = ('L', 'L', 'L', 'L')
 goal_state  = ('R', 'R', 'R', 'R')
 
-print("BFS путь:")
-bfs_path = bfs(start_state, goal_state)
-print_path(bfs_path)
-
-print("A* путь:")
-astar_path = astar(start_state, goal_state)
-print_path(astar_path)
-
-print("Обратный BFS путь:")
-rev_path = reverse_bfs(goal_state, start_state)
-print_path(rev_path)
+if __name__ == "__main__":
+    for title, solve, args in [("BFS путь:", bfs, (start_state, goal_state)),
+                               ("A* путь:", astar, (start_state, goal_state)),
+                               ("Обратный BFS путь:", reverse_bfs, (goal_state, start_state))]:
+        print(title)
+        path, expanded, peak = solve(*args)
+        print_path(path)
+        print(f"Раскрыто вершин: {expanded}, макс. размер очереди: {peak}\n")
@@ -0,0 +1,271 @@
+import hashlib
+
+import numpy as np
+
+
+class RiverPuzzle:
+    """
+    Обобщённая переправа: группы одинаковых предметов, лодка вместимостью capacity.
+
+    items — имена групп, counts — сколько в группе одинаковых предметов (по умолчанию
+    по одному). Состояние — целое число в смешанной системе счисления: разряд группы i
+    (основание counts[i] + 1) — сколько её предметов на правом берегу, старший разряд —
+    берег лодки. Когда все группы по одному предмету, это просто биты: бит i — берег
+    предмета i, бит n — лодка. Старт — все слева (0), цель — все справа.
+    Одинаковые предметы не размножают состояния: 16 миссионеров и 16 каннибалов —
+    это 17 · 17 · 2 состояний, а не 2^33.
+
+    farmer=True — в лодке всегда фермер (он и гребёт, места не занимает),
+    за рейс он берёт до capacity предметов. Пары групп conflicts нельзя оставлять
+    на берегу без фермера.
+    farmer=False — лодку ведёт хотя бы один из rowers, за рейс 1..capacity
+    предметов; пары conflicts недопустимы вместе ни на каком берегу.
+    bank_ok(counts) — дополнительное условие на каждый берег: получает массив
+    (M, число групп) — сколько предметов каждой группы на берегу — и возвращает
+    массив bool (например, миссионеров не меньше каннибалов).
+
+    Допустимость всех состояний и суммы разрядов считаются один раз таблицами.
+    Груз — тоже число: рейс направо прибавляет его к состоянию, налево — вычитает.
+    Если груза больше, чем есть на берегу, возникает перенос или заём между разрядами
+    и сумма разрядов не сходится, поэтому проверка груза — одно сравнение по таблице.
+    """
+
+    def __init__(self, items, conflicts=(), capacity=1, farmer=True, rowers=None, bank_ok=None,
+                 counts=None):
+        self.items = list(items)
+        self.counts = [1] * len(self.items) if counts is None else list(counts)
+        if len(self.counts) != len(self.items) or min(self.counts, default=1) < 1:
+            raise ValueError("counts — по положительному числу на каждую группу items")
+        self.n = sum(self.counts)
+        self.binary = all(c == 1 for c in self.counts)
+        self.capacity = capacity
+        self.farmer = farmer
+        self.radix = [c + 1 for c in self.counts]
+        self.strides = [int(np.prod(self.radix[:i], dtype=np.int64)) for i in range(len(self.radix))]
+        self.boat = int(np.prod(self.radix, dtype=np.int64))
+        self.full = self.boat - 1
+        self.size = 2 * self.boat
+        self.start, self.goal = 0, self.full + self.boat
+        index = {name: i for i, name in enumerate(self.items)}
+        self.conflicts = [(index[a], index[b]) for a, b in conflicts]
+
+        rower_groups = set(range(len(self.items)) if rowers is None else (index[r] for r in rowers))
+        self.loads = self._loads(0 if farmer else 1, rower_groups)
+        self.dsum, self.valid = self._tables(bank_ok)
+        self.load_sizes = self.dsum[self.loads].astype(np.int64)
+        # для поштучного интерфейса: индексация bytes быстрее, чем скаляров numpy
+        self._valid_bytes = self.valid.tobytes()
+
+    def _loads(self, smallest, rower_groups):
+        """Все грузы (сколько предметов каждой группы в лодке) числами, по возрастанию размера."""
+        loads = []
+
+        def place(i, room, size, code, rows):
+            if i == len(self.items):
+                if size >= smallest and (self.farmer or rows):
+                    loads.append((size, code))
+                return
+            for k in range(min(self.counts[i], room) + 1):
+                place(i + 1, room - k, size + k, code + k * self.strides[i],
+                      rows or (k > 0 and i in rower_groups))
+
+        place(0, self.capacity, 0, 0, False)
+        return np.array([code for _, code in sorted(loads)], dtype=np.int64)
+
+    def _tables(self, bank_ok):
+        """Сумма разрядов и допустимость для всех состояний."""
+        codes = np.arange(self.boat, dtype=np.int64)
+        dsum = np.zeros(self.boat, dtype=np.int16)
+        # bank_bad[m] — набор m нельзя оставить без присмотра
+        bank_bad = np.zeros(self.boat, dtype=bool)
+        present = {}
+        in_conflicts = {g for pair in self.conflicts for g in pair}
+        counts = np.empty((self.boat, len(self.items)), dtype=np.int32) if bank_ok else None
+        for i, (stride, radix) in enumerate(zip(self.strides, self.radix)):
+            digit = codes // stride % radix
+            dsum += digit.astype(np.int16)
+            if counts is not None:
+                counts[:, i] = digit
+            if i in in_conflicts:
+                present[i] = digit > 0
+        for a, b in self.conflicts:
+            bank_bad |= present[a] & present[b]
+        if bank_ok is not None:
+            bank_bad_any = ~np.asarray(bank_ok(counts), dtype=bool)
+        else:
+            bank_bad_any = np.zeros(self.boat, dtype=bool)
+
+        right = codes                      # предметы справа
+        left = self.full - codes           # предметы слева: по разрядам counts - right
+        valid = np.empty(self.size, dtype=bool)
+        for side in (0, 1):
+            unattended = left if side else right     # берег без лодки
+            attended = right if side else left
+            ok = ~bank_bad[unattended] & ~bank_bad_any[unattended] & ~bank_bad_any[attended]
+            if not self.farmer:
+                ok &= ~bank_bad[attended]
+            valid[side * self.boat:(side + 1) * self.boat] = ok
+        return dsum, valid
+
+    def fingerprint(self):
+        """Отпечаток задачи для кеша графа: меняется вместе с грузами или допустимостью состояний."""
+        h = hashlib.sha1(repr((self.counts, self.capacity, self.farmer)).encode("utf-8"))
+        h.update(self.loads.tobytes())
+        h.update(np.packbits(self.valid).tobytes())
+        return h.hexdigest()[:12]
+
+    # ---------- поштучный интерфейс (для bfs / astar из main.py) ----------
+    def neighbors(self, state):
+        dsum, valid = self.dsum, self._valid_bytes
+        result = []
+        if self.binary:
+            here = state & self.full if state & self.boat else ~state & self.full
+            for load in self.loads.tolist():
+                if load & here == load:
+                    nxt = state ^ load ^ self.boat
+                    if valid[nxt]:
+                        result.append(nxt)
+            return result
+        if state >= self.boat:             # лодка справа: груз уходит налево
+            right = state - self.boat
+            have = dsum[right]
+            for load, k in zip(self.loads.tolist(), self.load_sizes.tolist()):
+                nxt = right - load
+                if nxt >= 0 and dsum[nxt] == have - k and valid[nxt]:
+                    result.append(nxt)
+        else:
+            have = dsum[state]
+            for load, k in zip(self.loads.tolist(), self.load_sizes.tolist()):
+                nxt = state + load
+                if nxt <= self.full and dsum[nxt] == have + k and valid[nxt + self.boat]:
+                    result.append(nxt + self.boat)
+        return result
+
+    def heuristic(self, state, goal):
+        """Допустимая оценка: предметы не на своём берегу, не больше capacity за рейс."""
+        away = sum(abs(state // s % r - goal // s % r) for s, r in zip(self.strides, self.radix))
+        return -(-away // self.capacity)
+
+    def describe(self, state):
+        result = {"лодка": 'R' if state >= self.boat else 'L'}
+        for name, count, s, r in zip(self.items, self.counts, self.strides, self.radix):
+            k = state // s % r
+            result[name] = ('R' if k else 'L') if count == 1 else f"{count - k}L/{k}R"
+        return result
+
+    # ---------- поуровневый BFS на массивах ----------
+    def expand(self, part):
+        """
+        Все допустимые переходы из массива состояний part одной операцией numpy
+        (матрица «состояние × груз»). Возвращает (откуда, куда) — массивы одной длины.
+        """
+        if self.binary:
+            # все группы по одному предмету: груз помещается, если его биты есть на берегу
+            here = np.where(part & self.boat, part, ~part) & self.full
+            fits = (here[:, None] & self.loads) == self.loads
+            nxt = (part[:, None] ^ (self.loads | self.boat))[fits]
+            src = np.broadcast_to(part[:, None], fits.shape)[fits]
+            ok = self.valid[nxt]
+            return src[ok], nxt[ok]
+        on_right = part >= self.boat
+        right = np.where(on_right, part - self.boat, part)
+        sign = np.where(on_right, -1, 1)[:, None]
+        moved = right[:, None] + sign * self.loads
+        ok = (moved >= 0) & (moved <= self.full)
+        moved = np.where(ok, moved, 0)
+        ok &= self.dsum[moved] == self.dsum[right][:, None] + sign * self.load_sizes
+        nxt = moved + np.where(on_right, 0, self.boat)[:, None]
+        ok &= self.valid[nxt]
+        return np.broadcast_to(part[:, None], ok.shape)[ok], nxt[ok]
+
+    def bfs(self, start=None, goal=None, block=1 << 22):
+        """
+        BFS сразу по целому уровню: expand для всего фронта (фронт режется на куски,
+        чтобы матрица «состояние × груз» не превышала block элементов).
+        Родители хранятся в массиве на все состояния.
+        Возвращает (путь из целых состояний или None, раскрыто, макс. фронт).
+        """
+        start = self.start if start is None else start
+        goal = self.goal if goal is None else goal
+        parent = np.full(self.size, -1, dtype=np.int64)
+        parent[start] = start
+        frontier = np.array([start], dtype=np.int64)
+        step = max(1, block // max(len(self.loads), 1))
+        expanded, peak = 0, 1
+        while frontier.size and parent[goal] < 0:
+            expanded += frontier.size
+            found = []
+            for lo in range(0, frontier.size, step):
+                src, nxt = self.expand(frontier[lo:lo + step])
+                keep = parent[nxt] < 0
+                new, first = np.unique(nxt[keep], return_index=True)
+                parent[new] = src[keep][first]
+                found.append(new)
+            frontier = np.concatenate(found)
+            peak = max(peak, frontier.size)
+        if parent[goal] < 0:
+            return None, expanded, peak
+        path = [goal]
+        while path[-1] != start:
+            path.append(int(parent[path[-1]]))
+        return path[::-1], expanded, peak
+
+
+# ---------- готовые варианты ----------
+def farmer_wolf_goat_cabbage():
+    """Задача из main.py: бит 3 — фермер с лодкой, биты 0..2 — волк, коза, капуста."""
+    return RiverPuzzle(["Волк", "Коза", "Капуста"], [("Волк", "Коза"), ("Коза", "Капуста")])
+
+
+def n_items(n, conflicts=(), capacity=1):
+    """Фермер и n предметов 0..n-1; conflicts — пары номеров."""
+    return RiverPuzzle(range(n), conflicts, capacity)
+
+
+def missionaries_cannibals(m=3, c=3, capacity=2):
+    """
+    m миссионеров и c каннибалов, грести может любой. На каждом берегу,
+    где есть миссионеры, их должно быть не меньше, чем каннибалов.
+    Миссионеры между собой одинаковы, каннибалы тоже — две группы со счётчиками.
+    """
+    def bank_ok(counts):
+        mis, can = counts[:, 0], counts[:, 1]
+        return (mis == 0) | (mis >= can)
+
+    return RiverPuzzle(["M", "C"], capacity=capacity, farmer=False, bank_ok=bank_ok, counts=[m, c])
+
+
+if __name__ == "__main__":
+    import time
+
+    import main
+
+    # исходная задача: те же переходы, что get_neighbors в main.py
+    p = farmer_wolf_goat_cabbage()
+    to_tuple = lambda s: tuple('R' if s >> bit & 1 else 'L' for bit in (3, 0, 1, 2))
+    for s in range(16):
+        if p.valid[s]:
+            assert {to_tuple(x) for x in p.neighbors(s)} == set(main.get_neighbors(to_tuple(s)))
+    path, _, _ = p.bfs()
+    print("Волк, коза, капуста:", len(path) - 1, "рейсов")
+    print("Миссионеры и каннибалы 3/3:", len(missionaries_cannibals().bfs()[0]) - 1, "рейсов")
+
+    print(f"\n{'вариант':>28} {'состояний':>10} {'рейсов':>7} {'раскрыто':>9} "
+          f"{'numpy BFS, с':>13} {'main.bfs, с':>12}")
+    cases = [(f"{n} предметов, лодка {cap}", n_items(n, [(0, 1), (1, 2)], cap))
+             for n, cap in [(12, 1), (16, 2), (20, 2), (22, 1)]]
+    cases += [(f"миссионеры {k}/{k}, лодка {cap}", missionaries_cannibals(k, k, cap))
+              for k, cap in [(5, 3), (8, 4), (16, 4), (1000, 10)]]
+    for name, puzzle in cases:
+        t0 = time.perf_counter()
+        path, expanded, _ = puzzle.bfs()
+        t_np = time.perf_counter() - t0
+        steps = len(path) - 1 if path else None
+        t_py = "—"
+        if puzzle.size <= 1 << 17:
+            t0 = time.perf_counter()
+            ref, _, _ = main.bfs(puzzle.start, puzzle.goal, puzzle.neighbors)
+            t_py = f"{time.perf_counter() - t0:.3f}"
+            assert (ref is None and path is None) or len(ref) == len(path)
+        print(f"{name:>28} {puzzle.size:>10} {str(steps):>7} {expanded:>9} {t_np:>13.3f} {t_py:>12}",
+              flush=True)
@@ -0,0 +1,181 @@
+import numpy as np
+
+# Коды клеток в .npy-картах (и в GridWorld.to_array)
+FREE, WALL, ITEM, BASE = 0, 1, 2, 3
+# Символы текстовых карт
+CHARS = {".": FREE, " ": FREE, "#": WALL, "I": ITEM, "B": BASE}
+
+# Направления и имена действий создаются один раз, а не при каждом вызове
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+MOVES = ("move_up", "move_down", "move_left", "move_right")
+MOVES_BACK = ("move_up_back", "move_down_back", "move_left_back", "move_right_back")
+PICKUP, UNPICKUP = "pickup", "unpickup"
+
+
+class GridWorld:
+    """
+    Среда для алгоритмов из main.py: сетка со стенами, база и несколько предметов.
+    Состояние — (x, y, mask): mask — битовая маска собранных предметов.
+    Старт — база без предметов, цель — база со всеми предметами.
+
+    Карта хранится массивом uint8 с рамкой из стен (занятость клетки — один байт),
+    поэтому соседей можно перебирать без проверок границ. successors / predecessors —
+    генераторы: на вызов не создаются ни списки ходов, ни строки действий.
+    """
+
+    def __init__(self, codes):
+        codes = np.asarray(codes, dtype=np.uint8)
+        self.height, self.width = codes.shape
+        bases = np.argwhere(codes == BASE)
+        if len(bases) != 1:
+            raise ValueError(f"на карте должна быть ровно одна база, найдено {len(bases)}")
+        items = np.argwhere(codes == ITEM)
+        if len(items) > 62:
+            raise ValueError("не больше 62 предметов")
+        self.base = (int(bases[0][1]), int(bases[0][0]))
+        self.items = [(int(x), int(y)) for y, x in items]
+
+        # стены с рамкой: клетка (x, y) — байт (y + 1) * stride + x + 1
+        self.walls = np.ones((self.height + 2, self.width + 2), dtype=np.uint8)
+        self.walls[1:-1, 1:-1] = codes == WALL
+        self.stride = self.width + 2
+        self._free = (1 - self.walls).tobytes()
+        self._offsets = tuple(dy * self.stride + dx for dx, dy in DIRECTIONS)
+        self._item_bit = {self._cell(x, y): 1 << k for k, (x, y) in enumerate(self.items)}
+
+        self.all_items = (1 << len(self.items)) - 1
+        self.start = (*self.base, 0)
+        self.goal = (*self.base, self.all_items)
+
+    # ---------- загрузка и сохранение ----------
+    @classmethod
+    def from_text(cls, text):
+        lines = text.splitlines()
+        width = max(map(len, lines))
+        raw = "".join(line.ljust(width) for line in lines).encode("ascii", errors="replace")
+        lut = np.full(256, 255, dtype=np.uint8)
+        for ch, code in CHARS.items():
+            lut[ord(ch)] = code
+        codes = lut[np.frombuffer(raw, dtype=np.uint8)].reshape(len(lines), width)
+        bad = np.argwhere(codes == 255)
+        if len(bad):
+            y, x = bad[0]
+            raise ValueError(f"неизвестный символ {lines[y][x]!r} в строке {y + 1}")
+        return cls(codes)
+
+    @classmethod
+    def load(cls, path):
+        """Карта из .npy (коды FREE/WALL/ITEM/BASE) или текстового файла (# . I B)."""
+        if str(path).endswith(".npy"):
+            return cls(np.load(path))
+        with open(path, encoding="utf-8") as f:
+            return cls.from_text(f.read())
+
+    @classmethod
+    def random(cls, width, height, wall_prob=0.2, n_items=3, seed=0):
+        """Случайная карта; база и предметы ставятся на свободные клетки."""
+        rng = np.random.default_rng(seed)
+        codes = np.where(rng.random((height, width)) < wall_prob, WALL, FREE).astype(np.uint8)
+        cells = rng.choice(width * height, n_items + 1, replace=False)
+        codes.flat[cells[0]] = BASE
+        codes.flat[cells[1:]] = ITEM
+        return cls(codes)
+
+    def to_array(self):
+        codes = self.walls[1:-1, 1:-1].copy()
+        for x, y in self.items:
+            codes[y, x] = ITEM
+        codes[self.base[1], self.base[0]] = BASE
+        return codes
+
+    def save(self, path):
+        if str(path).endswith(".npy"):
+            np.save(path, self.to_array())
+            return
+        symbols = np.array([".", "#", "I", "B"])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join("".join(row) for row in symbols[self.to_array()]) + "\n")
+
+    # ---------- переходы ----------
+    def _cell(self, x, y):
+        return (y + 1) * self.stride + x + 1
+
+    def is_inside(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self._free[self._cell(x, y)] == 1
+
+    def successors(self, state):
+        x, y, mask = state
+        cell = (y + 1) * self.stride + x + 1
+        free = self._free
+        for (dx, dy), offset, name in zip(DIRECTIONS, self._offsets, MOVES):
+            if free[cell + offset]:
+                yield (x + dx, y + dy, mask), name
+        bit = self._item_bit.get(cell)
+        if bit is not None and not mask & bit:
+            yield (x, y, mask | bit), PICKUP
+
+    def predecessors(self, state):
+        x, y, mask = state
+        cell = (y + 1) * self.stride + x + 1
+        free = self._free
+        for (dx, dy), offset, name in zip(DIRECTIONS, self._offsets, MOVES_BACK):
+            if free[cell - offset]:
+                yield (x - dx, y - dy, mask), name
+        bit = self._item_bit.get(cell)
+        if bit is not None and mask & bit:
+            yield (x, y, mask & ~bit), UNPICKUP
+
+    def heuristic(self, state):
+        """
+        Допустимая оценка: если что-то не собрано — самый дальний маршрут
+        «до предмета и с ним на базу», иначе манхэттен до базы.
+        """
+        x, y, mask = state
+        bx, by = self.base
+        best = abs(x - bx) + abs(y - by)
+        for k, (ix, iy) in enumerate(self.items):
+            if not mask >> k & 1:
+                best = max(best, abs(x - ix) + abs(y - iy) + abs(ix - bx) + abs(iy - by))
+        return best
+
+
+def set_world(world, module=None):
+    """
+    Подставляет среду в глобальные имена main.py: четыре алгоритма
+    (bfs_forward, astar_forward, greedy_backward, bidirectional_bfs) работают без изменений.
+    """
+    if module is None:
+        import main as module
+    module.WIDTH, module.HEIGHT = world.width, world.height
+    module.BASE = world.base
+    module.ITEM_POS = world.items[0] if world.items else None
+    module.START_STATE, module.GOAL_STATE = world.start, world.goal
+    module.is_inside = world.is_inside
+    module.successors_forward = world.successors
+    module.predecessors_backward = world.predecessors
+    module.heuristic = world.heuristic
+    return module
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Алгоритмы main.py на большой карте")
+    parser.add_argument("map", nargs="?", help="карта .txt или .npy; без неё — случайная")
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--walls", type=float, default=0.2)
+    args = parser.parse_args()
+
+    world = (GridWorld.load(args.map) if args.map
+             else GridWorld.random(args.size, args.size, args.walls, args.items))
+    main = set_world(world)
+    print(f"карта {world.width}×{world.height}, стен {world.walls[1:-1, 1:-1].mean():.0%}, "
+          f"предметов {len(world.items)}, база {world.base}")
+    for title, solve in [("BFS", main.bfs_forward), ("A*", main.astar_forward),
+                         ("Обратный жадный", main.greedy_backward),
+                         ("Двунаправленный BFS", main.bidirectional_bfs)]:
+        path, visited, generated, b, t = solve()
+        length = len(path) - 1 if path else None
+        print(f"{title:>20}: длина {length}, посещено {visited}, сгенерировано {generated}, "
+              f"b={b:.2f}, {t:.3f} c", flush=True)